@@ -0,0 +1,383 @@
+"""
+Batch Conversion Module
+Streams CSV and JSONL files through the conversion engine
+Author: [Your Name]
+Date: November 24, 2025
+"""
+
+from collections import deque
+from itertools import islice
+import csv
+import io
+import json
+import math
+import os
+import time
+
+from converter import convert_many, resolve_units
+from validator import validate_number
+
+# Rows converted together in one convert_many() call
+CHUNK_ROWS = 4096
+
+# Buffer size for batch input/output files
+IO_BUFFER = 1 << 20
+
+# Default size of the byte range each worker process converts
+CHUNK_BYTES = 8 << 20
+
+def detect_format(filename):
+    """Guess the record format (csv/jsonl) from a file name"""
+    ext = os.path.splitext(filename)[1].lower()
+    if ext in ('.jsonl', '.ndjson', '.json'):
+        return 'jsonl'
+    return 'csv'
+
+def default_reject_file(out_file):
+    """Reject file used when none is given, e.g. converted.rejects.csv"""
+    root, ext = os.path.splitext(out_file)
+    return f"{root}.rejects{ext}"
+
+def read_csv_records(reader):
+    """
+    Yield (line_number, record, error) tuples from a csv.DictReader
+
+    The reader is passed in (rather than the file) so the caller can inspect
+    its fieldnames before streaming starts.
+    """
+    for record in reader:
+        yield reader.line_num, record, None
+
+def read_jsonl_records(f, first_line=1):
+    """
+    Yield (line_number, record, error) tuples from an open JSONL file
+
+    Lines that are not JSON objects are yielded with an error message
+    instead of a record so they can be rejected without aborting the run.
+    """
+    for line_no, line in enumerate(f, first_line):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_no, {'raw': line}, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield line_no, {'raw': line}, "Invalid JSON: expected an object"
+            continue
+        yield line_no, record, None
+
+def check_records(records, column, allow_negative=True):
+    """
+    Validate the value column of each record using the validator rules
+
+    Yields:
+        tuple: (line_number, record, value, error) - value is None on error
+    """
+    for line_no, record, error in records:
+        if error is not None:
+            yield line_no, record, None, error
+            continue
+
+        raw = record.get(column)
+        if raw is None:
+            yield line_no, record, None, f"Missing column '{column}'"
+            continue
+        if isinstance(raw, bool):
+            raw = str(raw)
+
+        try:
+            if isinstance(raw, (int, float)):
+                value = float(raw)
+                if not math.isfinite(value):
+                    raise ValueError("Please enter a finite number.")
+                if not allow_negative and value < 0:
+                    raise ValueError("Negative values not allowed.")
+            else:
+                value = validate_number(str(raw), allow_negative=allow_negative)
+        except (ValueError, OverflowError) as e:
+            yield line_no, record, None, str(e)
+            continue
+
+        yield line_no, record, value, None
+
+def convert_records(checked, category, from_unit, to_unit, output_column, chunk_rows=CHUNK_ROWS):
+    """
+    Convert validated records in fixed-size chunks
+
+    Each chunk of valid values goes through convert_many() in one call, so
+    memory stays bounded by chunk_rows no matter how large the input is.
+
+    Yields:
+        tuple: (line_number, record, error) - record carries output_column
+    """
+    checked = iter(checked)
+    while True:
+        chunk = list(islice(checked, chunk_rows))
+        if not chunk:
+            return
+
+        values = [value for _, _, value, error in chunk if error is None]
+        results = iter(convert_many(category, values, from_unit, to_unit))
+
+        for line_no, record, value, error in chunk:
+            if error is None:
+                record[output_column] = next(results)
+            yield line_no, record, error
+
+class _CsvSink:
+    """Writes converted and rejected records as CSV"""
+
+    def __init__(self, out, reject, fieldnames, output_column):
+        out_fields = list(fieldnames)
+        if output_column not in out_fields:
+            out_fields.append(output_column)
+        self.out = csv.DictWriter(out, fieldnames=out_fields, extrasaction='ignore')
+        self.reject = None
+        if reject is not None:
+            self.reject = csv.DictWriter(reject, fieldnames=list(fieldnames) + ['line', 'error'],
+                                         extrasaction='ignore')
+
+    def write_headers(self):
+        self.out.writeheader()
+        self.reject.writeheader()
+
+    def write_row(self, record):
+        self.out.writerow(record)
+
+    def write_reject(self, line_no, record, error):
+        row = dict(record)
+        row['line'] = line_no
+        row['error'] = error
+        self.reject.writerow(row)
+
+class _JsonlSink:
+    """Writes converted and rejected records as JSONL"""
+
+    def __init__(self, out, reject):
+        self.out = out
+        self.reject = reject
+
+    def write_headers(self):
+        pass
+
+    def write_row(self, record):
+        self.out.write(json.dumps(record) + '\n')
+
+    def write_reject(self, line_no, record, error):
+        self.reject.write(json.dumps({'line': line_no, 'error': error, 'record': record}) + '\n')
+
+def _make_sink(fmt, out, reject, fieldnames, output_column):
+    if fmt == 'csv':
+        return _CsvSink(out, reject, fieldnames, output_column)
+    return _JsonlSink(out, reject)
+
+def _read_header(in_file, fmt, column):
+    """
+    Read the CSV header row
+
+    Returns:
+        tuple: (fieldnames, byte offset of the first data row, header line count)
+    """
+    if fmt != 'csv':
+        return None, 0, 0
+    with open(in_file, 'rb') as f:
+        header = f.readline()
+    fieldnames = next(csv.reader([header.decode('utf-8')]), [])
+    if column not in fieldnames:
+        raise ValueError(f"Input has no column '{column}'")
+    return fieldnames, len(header), 1
+
+def _byte_ranges(start, size, chunk_bytes):
+    """Split [start, size) into consecutive ranges of chunk_bytes"""
+    return [(pos, min(pos + chunk_bytes, size)) for pos in range(start, size, chunk_bytes)]
+
+def _convert_range(job):
+    """
+    Worker: convert the records whose lines start inside one byte range
+
+    A line belongs to the range its first byte falls in, so every line is
+    handled by exactly one worker. The first partial line is skipped (the
+    previous range owns it) and the last one is read to completion.
+
+    Returns:
+        tuple: (converted text, [(relative line, record, error)], physical lines, rows)
+    """
+    (in_file, start, end, data_start, fmt, fieldnames, column, category,
+     from_unit, to_unit, output_column, allow_negative) = job
+
+    with open(in_file, 'rb') as f:
+        if start > data_start:
+            f.seek(start - 1)
+            f.readline()
+        else:
+            f.seek(start)
+        pos = f.tell()
+        data = f.read(end - pos) if pos < end else b''
+        if data and not data.endswith(b'\n'):
+            data += f.readline()
+
+    lines = data.count(b'\n')
+    if data and not data.endswith(b'\n'):
+        lines += 1
+
+    src = io.StringIO(data.decode('utf-8'), newline='')
+    if fmt == 'csv':
+        records = read_csv_records(csv.DictReader(src, fieldnames=fieldnames))
+    else:
+        records = read_jsonl_records(src)
+
+    out = io.StringIO(newline='')
+    sink = _make_sink(fmt, out, None, fieldnames, output_column)
+    rejects = []
+    rows = 0
+    checked = check_records(records, column, allow_negative)
+    for line_no, record, error in convert_records(checked, category, from_unit, to_unit, output_column):
+        rows += 1
+        if error is None:
+            sink.write_row(record)
+        else:
+            rejects.append((line_no, record, error))
+
+    return out.getvalue(), rejects, lines, rows
+
+def _run_stream(in_file, sink, fmt, column, category, from_unit, to_unit,
+                output_column, allow_negative):
+    """Convert the whole file in this process; returns (rows, rejected)"""
+    rows = rejected = 0
+    with open(in_file, 'r', encoding='utf-8', newline='', buffering=IO_BUFFER) as src:
+        if fmt == 'csv':
+            records = read_csv_records(csv.DictReader(src))
+        else:
+            records = read_jsonl_records(src)
+
+        checked = check_records(records, column, allow_negative)
+        for line_no, record, error in convert_records(checked, category, from_unit, to_unit, output_column):
+            rows += 1
+            if error is None:
+                sink.write_row(record)
+            else:
+                rejected += 1
+                sink.write_reject(line_no, record, error)
+    return rows, rejected
+
+def _run_parallel(in_file, out, sink, fmt, column, category, from_unit, to_unit,
+                  output_column, allow_negative, fieldnames, data_start, header_lines,
+                  workers, chunk_bytes):
+    """
+    Convert byte ranges of the file in worker processes; returns (rows, rejected)
+
+    Results are written strictly in input order. At most two ranges per
+    worker are in flight, so memory stays bounded by chunk_bytes * workers.
+    """
+    # Imported here: the process pool machinery is only needed with --workers
+    from concurrent.futures import ProcessPoolExecutor
+
+    size = os.path.getsize(in_file)
+    jobs = ((in_file, start, end, data_start, fmt, fieldnames, column, category,
+             from_unit, to_unit, output_column, allow_negative)
+            for start, end in _byte_ranges(data_start, size, chunk_bytes))
+
+    rows = rejected = 0
+    lines_before = header_lines
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for job in jobs:
+            pending.append(pool.submit(_convert_range, job))
+            if len(pending) < workers * 2:
+                continue
+            text, rejects, lines, count = pending.popleft().result()
+            lines_before, count_rejected = _write_range(out, sink, text, rejects, lines_before, lines)
+            rows += count
+            rejected += count_rejected
+
+        while pending:
+            text, rejects, lines, count = pending.popleft().result()
+            lines_before, count_rejected = _write_range(out, sink, text, rejects, lines_before, lines)
+            rows += count
+            rejected += count_rejected
+
+    return rows, rejected
+
+def _write_range(out, sink, text, rejects, lines_before, lines):
+    """Write one worker result, renumbering its rejects to absolute lines"""
+    out.write(text)
+    for line_no, record, error in rejects:
+        sink.write_reject(lines_before + line_no, record, error)
+    return lines_before + lines, len(rejects)
+
+def run_batch(in_file, out_file, category, from_unit, to_unit, column='value',
+              output_column='result', reject_file=None, fmt=None, allow_negative=True,
+              workers=1, chunk_bytes=CHUNK_BYTES):
+    """
+    Convert every record of a CSV/JSONL file and write the results
+
+    The file is processed as a generator pipeline (read -> validate ->
+    convert -> write), so it runs in constant memory regardless of size.
+    Rows that fail validation are written to the reject file with the line
+    number and reason instead of aborting the run.
+
+    With workers > 1 the file is split into byte ranges of chunk_bytes that
+    are converted in a process pool and written back in input order; the
+    output is byte-identical to a single-process run. Records must not
+    contain embedded newlines (quoted multi-line CSV fields) in that mode.
+
+    Args:
+        in_file (str): Input CSV/JSONL file
+        out_file (str): Output file (same format as the input)
+        category (str): Conversion category
+        from_unit (str): Source unit
+        to_unit (str): Target unit
+        column (str): Input column/key holding the value
+        output_column (str): Column/key that receives the result
+        reject_file (str): File for rejected rows (default: <out>.rejects.<ext>)
+        fmt (str): 'csv' or 'jsonl' (default: detected from in_file)
+        allow_negative (bool): Whether negative input values are accepted
+        workers (int): Worker processes (1 = this process, 0 = one per CPU)
+        chunk_bytes (int): Size of the byte range given to each worker
+
+    Returns:
+        dict: rows, converted, rejected, seconds and rows_per_sec
+
+    Raises:
+        ValueError: If the category, units, format or worker settings are invalid
+    """
+    category, from_unit, to_unit = resolve_units(category, from_unit, to_unit)
+
+    fmt = fmt or detect_format(in_file)
+    if fmt not in ('csv', 'jsonl'):
+        raise ValueError(f"Unsupported format: {fmt}")
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("Workers must be at least 1 (or 0 for one per CPU)")
+    if chunk_bytes < 1:
+        raise ValueError("Chunk size must be at least 1 byte")
+    reject_file = reject_file or default_reject_file(out_file)
+
+    start = time.perf_counter()
+    fieldnames, data_start, header_lines = _read_header(in_file, fmt, column)
+
+    with open(out_file, 'w', encoding='utf-8', newline='', buffering=IO_BUFFER) as out, \
+         open(reject_file, 'w', encoding='utf-8', newline='', buffering=IO_BUFFER) as reject:
+        sink = _make_sink(fmt, out, reject, fieldnames, output_column)
+        sink.write_headers()
+
+        if workers == 1:
+            rows, rejected = _run_stream(in_file, sink, fmt, column, category, from_unit,
+                                         to_unit, output_column, allow_negative)
+        else:
+            rows, rejected = _run_parallel(in_file, out, sink, fmt, column, category, from_unit,
+                                           to_unit, output_column, allow_negative, fieldnames,
+                                           data_start, header_lines, workers, chunk_bytes)
+
+    seconds = time.perf_counter() - start
+    return {
+        'rows': rows,
+        'converted': rows - rejected,
+        'rejected': rejected,
+        'seconds': seconds,
+        'rows_per_sec': rows / seconds if seconds > 0 else 0.0
+    }
@@ -0,0 +1,296 @@
+"""
+Benchmark Suite
+Times the converter, history persistence and logging hot paths
+Author: [Your Name]
+Date: November 24, 2025
+
+Usage:
+    python benchmarks/bench.py run --out results.json [--quick] [--only PREFIX]
+    python benchmarks/bench.py compare old.json new.json [--threshold 10]
+"""
+
+from datetime import datetime
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import converter
+from history import ConversionHistory, ConversionRecord
+from logger import ApplicationLogger
+
+SCALAR_PAIRS = {
+    'length': ('foot', 'meter'),
+    'temperature': ('fahrenheit', 'celsius'),
+    'weight': ('pound', 'kilogram'),
+    'time': ('hour', 'minute')
+}
+
+# Registered benchmarks: name -> setup() returning (callable, operations per call)
+BENCHMARKS = {}
+
+def benchmark(name):
+    """Register a benchmark setup function under name"""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+def measure(fn, ops, repeat):
+    """
+    Run fn repeat times and report per-operation timings
+
+    Returns:
+        dict: best/median seconds per operation, ops per run and repeat count
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) / ops)
+    return {
+        'best': min(timings),
+        'median': statistics.median(timings),
+        'ops': ops,
+        'repeat': repeat
+    }
+
+def _values(n):
+    rng = random.Random(42)
+    return [round(rng.uniform(-1000, 1000), 3) for _ in range(n)]
+
+for _category, (_from, _to) in SCALAR_PAIRS.items():
+    def _scalar(category=_category, from_unit=_from, to_unit=_to):
+        func = getattr(converter, 'convert_' + category)
+        values = _values(10000)
+        def run():
+            for v in values:
+                func(v, from_unit, to_unit)
+        return run, len(values)
+
+    def _bulk(category=_category, from_unit=_from, to_unit=_to):
+        values = _values(100000)
+        def run():
+            converter.convert_many(category, values, from_unit, to_unit)
+        return run, len(values)
+
+    benchmark(f"convert.scalar.{_category}")(_scalar)
+    benchmark(f"convert.bulk.{_category}")(_bulk)
+
+@benchmark("convert.scalar.compound")
+def _compound():
+    values = _values(10000)
+    def run():
+        for v in values:
+            converter.convert('compound', v, 'mi/h', 'm/s')
+    return run, len(values)
+
+@benchmark("convert.parse_many")
+def _parse_many():
+    rng = random.Random(42)
+    units = ('kg', 'lbs', 'g', 'oz')
+    texts = [f"{v}{rng.choice(units)}" if i % 2 else f"{v} {rng.choice(units)}"
+             for i, v in enumerate(_values(100000))]
+    def run():
+        converter.parse_many(texts, category='weight', to_unit='kilogram')
+    return run, len(texts)
+
+def _add_conversion(max_entries, journal):
+    def setup():
+        hist = ConversionHistory(max_entries=max_entries,
+                                 filename=os.path.abspath('bench_history.json'), journal=journal)
+        for i in range(max_entries):
+            hist.add_conversion('length', i, 'foot', 'meter', i * 0.3048)
+        adds = 200
+        def run():
+            for i in range(adds):
+                hist.add_conversion('length', i, 'foot', 'meter', i * 0.3048)
+        return run, adds
+    return setup
+
+for _size in (50, 1000, 10000):
+    benchmark(f"history.add.json.{_size}")(_add_conversion(_size, False))
+    benchmark(f"history.add.journal.{_size}")(_add_conversion(_size, True))
+
+def _load(entries):
+    def setup():
+        hist = ConversionHistory(max_entries=entries, filename=os.path.abspath('bench_load.json'))
+        now = time.time()
+        hist._reset(ConversionRecord(now, 'length', i, 'foot', 'meter', i * 0.3048)
+                    for i in range(entries))
+        hist.save_to_file()
+        def run():
+            hist.load_from_file()
+        return run, 1
+    return setup
+
+for _size in (10000, 100000):
+    benchmark(f"history.load.{_size}")(_load(_size))
+
+@benchmark("history.recent.mmap.1000000")
+def _recent_mmap():
+    from history_mmap import MappedConversionHistory
+    filename = os.path.abspath('bench_history.bin')
+    hist = MappedConversionHistory(filename, flush_every=100000)
+    for i in range(1000000):
+        hist.add_conversion('length', i, 'foot', 'meter', i * 0.3048)
+    hist.close()
+    def run():
+        # Open the file and show the last 15 entries, as the history menu does
+        view = MappedConversionHistory(filename)
+        view.recent(15)
+        view.close()
+    return run, 1
+
+@benchmark("history.analytics.mmap.1000000")
+def _analytics_mmap():
+    from history_mmap import MappedConversionHistory
+    filename = os.path.abspath('bench_analytics.bin')
+    hist = MappedConversionHistory(filename, flush_every=100000)
+    units = ('foot', 'inch', 'mile', 'yard')
+    for i, value in enumerate(_values(1000000)):
+        hist.add_conversion('length', value, units[i % 4], 'meter', value)
+    def run():
+        hist.get_analytics()
+    return run, 1
+
+def _log_throughput(async_write):
+    def setup():
+        log = ApplicationLogger(filename=os.path.abspath('bench.log'), async_write=async_write)
+        lines = 20000
+        def run():
+            for i in range(lines):
+                log._log(ApplicationLogger.INFO, f"Conversion - length: {i} foot → {i * 0.3048} meter")
+            log.flush()
+        return run, lines
+    return setup
+
+benchmark("logger.log.sync")(_log_throughput(False))
+benchmark("logger.log.async")(_log_throughput(True))
+
+@benchmark("logger.summary.200000")
+def _log_summary():
+    log = ApplicationLogger(filename=os.path.abspath('bench_summary.log'), async_write=True)
+    for i in range(200000):
+        log._log(ApplicationLogger.INFO if i % 10 else ApplicationLogger.ERROR, f"message {i}")
+    log.flush()
+    def run():
+        # Measure a full pass: drop the incremental state first
+        if os.path.exists(log.filename + '.summary.json'):
+            os.remove(log.filename + '.summary.json')
+        log.get_log_summary()
+    return run, 1
+
+@benchmark("startup.first_prompt")
+def _startup():
+    """Time from launching main.py to its first menu prompt (budget: a few tens of ms)"""
+    def run():
+        proc = subprocess.Popen([sys.executable, os.path.join(ROOT, 'main.py')],
+                                stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL)
+        output = b''
+        while b'Enter your choice' not in output:
+            chunk = proc.stdout.read1(4096)
+            if not chunk:
+                break
+            output += chunk
+        proc.kill()
+        proc.wait()
+    return run, 1
+
+def run_benchmarks(out_file, quick=False, only=None, repeat=5):
+    """Run all (or matching) benchmarks in a scratch directory and write JSON results"""
+    if quick:
+        repeat = 3
+    names = [name for name in BENCHMARKS if not only or name.startswith(only)]
+
+    results = {}
+    cwd = os.getcwd()
+    out_file = os.path.abspath(out_file)
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        try:
+            for name in names:
+                if quick and name.endswith(('.10000', '.100000', '.200000', '.1000000')):
+                    continue
+                fn, ops = BENCHMARKS[name]()
+                results[name] = measure(fn, ops, repeat)
+                print(f"{name:32s} {results[name]['median'] * 1e6:12.3f} µs/op")
+        finally:
+            os.chdir(cwd)
+
+    report = {
+        'meta': {
+            'created': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': converter._numpy() is not None
+        },
+        'results': results
+    }
+    with open(out_file, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {out_file}")
+
+def compare(old_file, new_file, threshold=10.0):
+    """
+    Compare two result files and flag benchmarks that got slower
+
+    Args:
+        threshold (float): Percent slowdown (of the median) treated as a regression
+
+    Returns:
+        int: Number of regressions
+    """
+    with open(old_file) as f:
+        old = json.load(f)['results']
+    with open(new_file) as f:
+        new = json.load(f)['results']
+
+    regressions = 0
+    print(f"{'benchmark':32s} {'old µs/op':>12s} {'new µs/op':>12s} {'change':>9s}")
+    for name in sorted(set(old) & set(new)):
+        before = old[name]['median']
+        after = new[name]['median']
+        change = (after - before) / before * 100 if before else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{name:32s} {before * 1e6:12.3f} {after * 1e6:12.3f} {change:+8.1f}%{flag}")
+    for name in sorted(set(old) ^ set(new)):
+        print(f"{name:32s} (only in {'old' if name in old else 'new'} results)")
+
+    print(f"\n{regressions} regression(s) above {threshold}%")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Unit Converter Pro benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="run the benchmarks")
+    run.add_argument("--out", default="bench_results.json", help="JSON results file")
+    run.add_argument("--quick", action="store_true", help="skip the largest sizes, fewer repeats")
+    run.add_argument("--only", help="run only benchmarks whose name starts with this prefix")
+    run.add_argument("--repeat", type=int, default=5, help="runs per benchmark (default: 5)")
+    cmp = commands.add_parser("compare", help="compare two result files")
+    cmp.add_argument("old")
+    cmp.add_argument("new")
+    cmp.add_argument("--threshold", type=float, default=10.0, help="percent slowdown to flag")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        run_benchmarks(args.out, quick=args.quick, only=args.only, repeat=args.repeat)
+    else:
+        sys.exit(1 if compare(args.old, args.new, args.threshold) else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Concurrency Stress Test
+Runs several processes against one history and log and checks nothing is lost
+Author: [Your Name]
+Date: November 24, 2025
+
+Usage:
+    python benchmarks/stress.py [--processes 4] [--records 500] [--mode journal|json] [--flush-every 1]
+"""
+
+from multiprocessing import get_context
+import argparse
+import gzip
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from history import ConversionHistory
+from logger import ApplicationLogger
+
+def _history(directory, mode, max_entries, flush_every):
+    return ConversionHistory(max_entries=max_entries,
+                             filename=os.path.join(directory, 'conversion_history.json'),
+                             journal=(mode == 'journal'), compact_every=max_entries // 4 or 1,
+                             flush_every=flush_every)
+
+def _worker(args):
+    """One process: record `records` conversions, each tagged with (worker, sequence)"""
+    worker, directory, mode, records, max_entries, flush_every, log_bytes = args
+    hist = _history(directory, mode, max_entries, flush_every)
+    log = ApplicationLogger(filename=os.path.join(directory, 'application.log'),
+                            async_write=True, batch_size=64, max_bytes=log_bytes,
+                            max_archives=10000)
+    start = time.perf_counter()
+    for seq in range(records):
+        # The value encodes who wrote the record so the checker can find gaps
+        value = worker * 1_000_000 + seq
+        hist.add_conversion('length', value, 'foot', 'meter', value * 0.3048)
+        log.info(f"stress worker={worker} seq={seq}")
+    hist.close()
+    log.close_session()
+    return time.perf_counter() - start
+
+def _check_history(directory, mode, processes, records):
+    path = os.path.join(directory, 'conversion_history.jsonl' if mode == 'journal'
+                        else 'conversion_history.json')
+    with open(path, 'r', encoding='utf-8') as f:
+        if mode == 'journal':
+            items = [json.loads(line) for line in f]
+        else:
+            items = json.load(f)
+    found = {int(item['value']) for item in items}
+    expected = {w * 1_000_000 + s for w in range(processes) for s in range(records)}
+    return len(items), len(expected - found), len(items) - len(found)
+
+def _check_log(directory, processes, records):
+    """Count intact stress lines across the live log and any rotated archives"""
+    seen = set()
+    broken = 0
+    for name in os.listdir(directory):
+        if not name.startswith('application.log') or name.endswith(('.json', '.lock')):
+            continue
+        path = os.path.join(directory, name)
+        opener = gzip.open if name.endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if 'stress worker=' not in line:
+                    continue
+                try:
+                    fields = dict(part.split('=') for part in line.split('] ', 2)[2].split()[1:])
+                    seen.add((int(fields['worker']), int(fields['seq'])))
+                except (ValueError, KeyError, IndexError):
+                    broken += 1
+    return processes * records - len(seen), broken
+
+def run_stress(processes=4, records=500, mode='journal', flush_every=1, log_bytes=None):
+    """
+    Run the stress test in a scratch directory
+
+    Returns:
+        bool: True if every record reached the history and the log intact
+    """
+    max_entries = processes * records  # large enough that nothing is trimmed
+    with tempfile.TemporaryDirectory() as directory:
+        jobs = [(w, directory, mode, records, max_entries, flush_every, log_bytes)
+                for w in range(processes)]
+        start = time.perf_counter()
+        with get_context('spawn').Pool(processes) as pool:
+            pool.map(_worker, jobs)
+        elapsed = time.perf_counter() - start
+
+        kept, missing, duplicates = _check_history(directory, mode, processes, records)
+        log_missing, log_broken = _check_log(directory, processes, records)
+
+    total = processes * records
+    print(f"{processes} processes x {records} records ({mode}, flush every {flush_every}): "
+          f"{elapsed:.2f}s, {total / elapsed:,.0f} records/sec")
+    print(f"   history: {kept} kept, {missing} missing, {duplicates} duplicated")
+    print(f"   log:     {log_missing} missing, {log_broken} torn lines")
+    return missing == 0 and duplicates == 0 and log_missing == 0 and log_broken == 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-process history/log stress test")
+    parser.add_argument("--processes", type=int, default=4, help="concurrent processes (default: 4)")
+    parser.add_argument("--records", type=int, default=500, help="conversions per process (default: 500)")
+    parser.add_argument("--mode", choices=["journal", "json"], default="journal", help="history storage")
+    parser.add_argument("--flush-every", type=int, default=1, help="history batch size (default: 1)")
+    parser.add_argument("--log-bytes", type=int, help="rotate the log at this size to test rotation")
+    args = parser.parse_args()
+    ok = run_stress(args.processes, args.records, args.mode, args.flush_every, args.log_bytes)
+    print("OK" if ok else "FAILED")
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -6,39 +6,341 @@ Date: November 24, 2025
 """
 
 import math
+import re
+import threading
+from array import array
+from collections import OrderedDict, namedtuple
 
-# Length conversion factors (all to meters as base)
-LENGTH_UNITS = {
-    'meter': 1.0,
-    'kilometer': 1000.0,
-    'centimeter': 0.01,
-    'millimeter': 0.001,
-    'mile': 1609.344,
-    'yard': 0.9144,
-    'foot': 0.3048,
-    'inch': 0.0254
-}
-
-# Weight conversion factors (all to kilograms as base)
-WEIGHT_UNITS = {
-    'kilogram': 1.0,
-    'gram': 0.001,
-    'milligram': 0.000001,
-    'pound': 0.453592,
-    'ounce': 0.0283495,
-    'ton': 1000.0
-}
-
-# Time conversion factors (all to seconds as base)
-TIME_UNITS = {
-    'second': 1.0,
-    'minute': 60.0,
-    'hour': 3600.0,
-    'day': 86400.0,
-    'week': 604800.0,
-    'month': 2592000.0,  # 30 days average
-    'year': 31536000.0   # 365 days
-}
+from metrics import timed
+from units import load_registry
+
+# NumPy is optional (batch conversion falls back to pure Python) and is only
+# imported by _numpy() when an array batch needs it, as it dominates startup time
+np = None
+_numpy_checked = False
+
+# Unit definitions live in units.json; see units.py for the compiled layout
+REGISTRY = load_registry()
+
+# Rounding precision used by each category's converter: decimal places,
+# and the significant digits kept for results too small for them (0: none)
+CATEGORY_PRECISION = REGISTRY['precision']
+CATEGORY_SIGNIFICANT = REGISTRY['significant']
+
+# Linear categories and their base-unit factor tables
+LINEAR_CATEGORIES = REGISTRY['linear']
+
+# Affine categories (temperature): unit -> (to-base scale, to-base offset,
+# from-base scale, from-base offset)
+AFFINE_CATEGORIES = REGISTRY['affine']
+
+# Display names for menus and messages
+CATEGORY_LABELS = REGISTRY['labels']
+
+# Linear categories' dimensions ({'length': 1, 'time': -1}) and the size of
+# their base unit in coherent base units (liter: 0.001 cubic meters)
+CATEGORY_DIMENSIONS = REGISTRY['dimensions']
+CATEGORY_SCALES = REGISTRY['scales']
+
+# Pseudo-category whose units are products and quotients of other units
+COMPOUND_CATEGORY = 'compound'
+
+# Most entries kept by each memo keyed on user input (unit spellings,
+# compound units, pairs): a long-running service sees unlimited spellings
+MEMO_LIMIT = 4096
+
+def _memoize(memo, key, value):
+    """Store value in memo, emptying it first once it holds MEMO_LIMIT entries"""
+    if len(memo) >= MEMO_LIMIT:
+        memo.clear()  # entries are cheap to rebuild; clear() is atomic for threads
+    memo[key] = value
+
+class _ConversionTable(dict):
+    """
+    Pairwise (scale, divisor, offset, ndigits, small) table, filled in on first use
+    
+    Every conversion, including temperature, becomes the same affine kernel
+    value * scale / divisor + offset, rounded to ndigits decimal places
+    unless its magnitude is below small (see _round_small()). Linear categories keep the source and
+    target factors separate so results match the base-unit method bit for
+    bit (folding them into one scale changes rounding at half-way ties);
+    affine units fold into scale and offset with a divisor of 1.0. Compound
+    units use their factors to coherent base units (see compound_unit()).
+    
+    Entries are built the first time a pair is looked up with [], so the
+    table never holds more pairs than are actually used (and at most
+    MEMO_LIMIT). get() does not build entries.
+    """
+    
+    def __missing__(self, key):
+        category, from_unit, to_unit = key
+        ndigits = CATEGORY_PRECISION[category]
+        significant = CATEGORY_SIGNIFICANT[category]
+        factors = LINEAR_CATEGORIES.get(category)
+        if category == COMPOUND_CATEGORY:
+            _, from_factor, from_dimension, from_significant = compound_unit(from_unit)
+            _, to_factor, to_dimension, to_significant = compound_unit(to_unit)
+            if from_dimension != to_dimension:
+                raise KeyError(key)
+            # Round like the categories on both sides, whichever way round the pair is
+            significant = min(significant, from_significant, to_significant)
+        # Magnitude below which ndigits decimals keep fewer significant digits
+        small = 10.0 ** (significant - 1 - ndigits) if significant else 0.0
+        if category == COMPOUND_CATEGORY:
+            entry = (from_factor, to_factor, 0.0, ndigits, small)
+        elif factors is not None:
+            entry = (factors[from_unit], factors[to_unit], 0.0, ndigits, small)
+        else:
+            units = AFFINE_CATEGORIES[category]
+            in_scale, in_offset, _, _ = units[from_unit]
+            _, _, out_scale, out_offset = units[to_unit]
+            entry = (in_scale * out_scale, 1.0, in_offset * out_scale + out_offset, ndigits, small)
+        _memoize(self, key, entry)
+        return entry
+
+CONVERSION_TABLE = _ConversionTable()
+
+# (category, alias) -> canonical unit. Names, plurals, abbreviations and
+# symbols are stored as written and lowercased, so a lookup is one
+# dictionary hit for the usual spellings and at most two otherwise.
+UNIT_INDEX = REGISTRY['index']
+
+def resolve_unit(category, unit):
+    """
+    Map a unit name, plural, abbreviation or symbol to its canonical name
+    
+    Args:
+        category (str): Conversion category (lowercase)
+        unit (str): Unit as typed, e.g. 'ft', 'Feet' or '°F' ('mi/h' for
+                    the compound category)
+    
+    Returns:
+        str: Canonical unit name, or None if the unit is not known
+    """
+    try:
+        return UNIT_INDEX[(category, unit)]
+    except KeyError:
+        pass
+    canonical = UNIT_INDEX.get((category, unit.strip().lower()))
+    if canonical is None and category == COMPOUND_CATEGORY:
+        try:
+            canonical = compound_unit(unit)[0]
+        except ValueError:
+            pass
+    return canonical
+
+def resolve_units(category, from_unit, to_unit):
+    """
+    Resolve a category and unit pair to canonical names
+    
+    Returns:
+        tuple: (category, from_unit, to_unit), all canonical
+    
+    Raises:
+        ValueError: If the category or either unit is not known, or two
+                    compound units have different dimensions
+    """
+    category = category.lower()
+    src = resolve_unit(category, from_unit)
+    dst = resolve_unit(category, to_unit)
+    if src is None or dst is None:
+        raise _unit_error(category, from_unit, to_unit)
+    if category == COMPOUND_CATEGORY and compound_unit(src)[2] != compound_unit(dst)[2]:
+        raise ValueError(f"Incompatible units: {src} ({_dimension_name(src)}) and "
+                         f"{dst} ({_dimension_name(dst)})")
+    return category, src, dst
+
+# Operators between the factors of a compound unit, and exponents
+_COMPOUND_TIMES = re.compile(r"\s*[*·⋅×]\s*")
+_COMPOUND_POWER = re.compile(r"(.+?)\s*(?:\^\s*([-+]?\d+)|([²³]))")
+_SUPERSCRIPTS = {'²': 2, '³': 3}
+
+# Compound unit text -> (canonical name, factor, dimension), filled on first use
+_compound_units = {}
+
+def _factor_unit(text):
+    """(category, canonical unit) for one factor of a compound unit"""
+    for candidate in (text, text.lower()):
+        if candidate in _SYMBOL_INDEX:
+            found = _SYMBOL_INDEX[candidate]
+            if found is None:
+                raise ValueError(f"Ambiguous unit: {text}")
+            if found[0] not in CATEGORY_DIMENSIONS:
+                raise ValueError(f"{CATEGORY_LABELS[found[0]]} units cannot be combined: {text}")
+            return found
+    raise ValueError(f"Unknown unit: {text}")
+
+def compound_unit(text):
+    """
+    Parse a compound unit such as 'mile/hour', 'kg·m' or 'm/s^2'
+    
+    Factors are joined by *, · or × and may carry an exponent (^2, ², ^-1);
+    everything after a '/' is in the denominator ('J/kg·s' is J/(kg·s)).
+    Each factor is any alias of a unit in a category with a dimension in
+    units.json, so 'kWh/km' and 'mi/gal' work as well as base units. Parsed
+    units are memoized (up to MEMO_LIMIT), including under their canonical
+    name.
+    
+    A compound unit keeps significant digits only as far as every category
+    it is built from does, so 'm^3' rounds like length and 'kWh/km' rounds
+    like length rather than energy.
+    
+    Args:
+        text (str): Compound unit
+    
+    Returns:
+        tuple: (canonical name, factor to coherent base units, dimension as
+               a sorted tuple of (base dimension, exponent) pairs, significant
+               digits of its categories)
+    
+    Raises:
+        ValueError: If a factor is unknown, ambiguous or cannot be combined,
+                    or the combined factor overflows or underflows
+    """
+    try:
+        return _compound_units[text]
+    except KeyError:
+        pass
+    
+    stripped = text.strip()
+    if stripped in _SYMBOL_INDEX or stripped.lower() in _SYMBOL_INDEX:
+        # A whole alias such as 'km/h' or 'N/m²' is a single factor
+        parts = [(stripped, 1)]
+    else:
+        numerator, *denominators = stripped.split('/')
+        parts = [(factor, 1) for factor in _COMPOUND_TIMES.split(numerator.strip())
+                 if not (denominators and factor == '1')]
+        for denominator in denominators:
+            parts += [(factor, -1) for factor in _COMPOUND_TIMES.split(denominator.strip())]
+    
+    exponents = {}
+    for factor, sign in parts:
+        if not factor:
+            raise ValueError(f"Invalid compound unit: {text!r}")
+        power = 1
+        if factor not in _SYMBOL_INDEX and factor.lower() not in _SYMBOL_INDEX:
+            match = _COMPOUND_POWER.fullmatch(factor)
+            if match is not None:
+                factor = match.group(1)
+                power = int(match.group(2)) if match.group(2) else _SUPERSCRIPTS[match.group(3)]
+        unit = _factor_unit(factor)
+        exponents[unit] = exponents.get(unit, 0) + sign * power
+    
+    numerator_factor = denominator_factor = 1.0
+    dimension = {}
+    above = []
+    below = []
+    significant = None
+    try:
+        for (category, unit), power in exponents.items():
+            if power == 0:
+                continue
+            base = LINEAR_CATEGORIES[category][unit] * CATEGORY_SCALES[category]
+            for name, exponent in CATEGORY_DIMENSIONS[category].items():
+                dimension[name] = dimension.get(name, 0) + exponent * power
+            if significant is None or CATEGORY_SIGNIFICANT[category] < significant:
+                significant = CATEGORY_SIGNIFICANT[category]
+            if power > 0:
+                numerator_factor *= base ** power
+                above.append(unit if power == 1 else f"{unit}^{power}")
+            else:
+                denominator_factor *= base ** -power
+                below.append(unit if power == -1 else f"{unit}^{-power}")
+        factor = numerator_factor / denominator_factor
+    except (OverflowError, ZeroDivisionError):
+        factor = 0.0
+    # 'ly^40' or 'm/nm^40' leave the float range
+    if not factor or not math.isfinite(factor):
+        raise ValueError("Unit factor out of range")
+    
+    name = '·'.join(above) or '1'
+    if below:
+        name += '/' + '·'.join(below)
+    result = (name, factor, tuple(sorted((k, v) for k, v in dimension.items() if v)),
+              significant or 0)
+    _memoize(_compound_units, text, result)
+    _memoize(_compound_units, name, result)
+    return result
+
+def _dimension_name(unit):
+    """Readable dimension of a compound unit, e.g. 'length/time'"""
+    dimension = compound_unit(unit)[2]
+    above = [name if power == 1 else f"{name}^{power}" for name, power in dimension if power > 0]
+    below = [name if power == -1 else f"{name}^{-power}" for name, power in dimension if power < 0]
+    return ('·'.join(above) or '1') + ('/' + '·'.join(below) if below else '')
+
+def _coefficients(category, from_unit, to_unit):
+    """
+    Look up a pair's table entry, resolving aliases only when needed
+    
+    A pair spelled with aliases ('mi/h', 'm/s') is stored under that
+    spelling too, so repeating it costs one dictionary hit like a pair of
+    canonical names.
+    """
+    key = (category, from_unit, to_unit)
+    entry = CONVERSION_TABLE.get(key)
+    if entry is None:
+        entry = CONVERSION_TABLE[resolve_units(category, from_unit, to_unit)]
+        _memoize(CONVERSION_TABLE, key, entry)
+    return entry
+
+def _unit_error(category, from_unit, to_unit):
+    """Build the ValueError describing why a conversion lookup failed"""
+    category = category.lower()
+    if category not in CATEGORY_UNITS:
+        return ValueError(f"Invalid category: {category}")
+    if category in AFFINE_CATEGORIES:
+        *units, last = CATEGORY_UNITS[category]
+        return ValueError(f"{CATEGORY_LABELS[category]} units must be: {', '.join(units)}, or {last}")
+    if category == COMPOUND_CATEGORY:
+        for unit, role in ((from_unit, 'source'), (to_unit, 'target')):
+            try:
+                compound_unit(unit)
+            except ValueError as e:
+                return ValueError(f"Invalid {role} unit: {e}")
+    if resolve_unit(category, from_unit) is None:
+        return ValueError(f"Invalid source unit: {from_unit.lower()}")
+    return ValueError(f"Invalid target unit: {to_unit.lower()}")
+
+@timed('convert')
+def convert(category, value, from_unit, to_unit):
+    """
+    Convert a value between two units of the same category
+    
+    Uses the precompiled CONVERSION_TABLE: one dictionary lookup for the
+    pair's coefficients, then one affine kernel and round() (to the
+    category's significant digits when the result is too small for its
+    decimal places, so 1 eV is 1.60218e-19 J rather than 0.0). Units may be
+    given as any alias in units.json ('ft', 'feet', '°F', ...).
+    
+    Args:
+        category (str): Conversion category (see get_categories())
+        value (float): The value to convert
+        from_unit (str): Source unit
+        to_unit (str): Target unit
+    
+    Returns:
+        float: Converted value
+    
+    Raises:
+        ValueError: If the category or units are invalid
+    """
+    scale, divisor, offset, ndigits, small = _coefficients(category, from_unit, to_unit)
+    result = value * scale / divisor + offset
+    if -small < result < small:
+        return _round_small(result, ndigits, small)
+    return round(result, ndigits)
+
+def _round_small(value, ndigits, small):
+    """
+    Round a result whose magnitude is below its pair's small threshold
+    
+    small is 10 ** (significant - 1 - ndigits), so value keeps the
+    category's significant digits instead of rounding towards zero.
+    """
+    if not value:
+        return round(value, ndigits)
+    return round(value, ndigits - math.floor(math.log10(abs(value)) - math.log10(small)))
 
 def convert_length (value, from_unit, to_unit):
     """
@@ -55,18 +357,7 @@ def convert_length (value, from_unit, to_unit):
     Raises:
         ValueError: If units are invalid
     """
-    from_unit = from_unit.lower()
-    to_unit = to_unit.lower()
-    
-    if from_unit not in LENGTH_UNITS:
-        raise ValueError(f"Invalid source unit: {from_unit}")
-    if to_unit not in LENGTH_UNITS:
-        raise ValueError(f"Invalid target unit: {to_unit}")
-    
-    # Convert to base unit (meters) then to target
-    meters = value * LENGTH_UNITS[from_unit]
-    result = meters / LENGTH_UNITS[to_unit]
-    return round(result, 6)
+    return convert('length', value, from_unit, to_unit)
 
 def convert_temperature (value, from_unit, to_unit):
     """
@@ -83,30 +374,7 @@ def convert_temperature (value, from_unit, to_unit):
     Raises:
         ValueError: If units are invalid
     """
-    from_unit = from_unit.lower()
-    to_unit = to_unit.lower()
-    
-    valid_units = ['celsius', 'fahrenheit', 'kelvin']
-    if from_unit not in valid_units or to_unit not in valid_units:
-        raise ValueError("Temperature units must be: celsius, fahrenheit, or kelvin")
-    
-    # Convert to Celsius as intermediate
-    if from_unit == 'celsius':
-        celsius = value
-    elif from_unit == 'fahrenheit':
-        celsius = (value - 32) * 5.0 / 9.0
-    elif from_unit == 'kelvin':
-        celsius = value - 273.15
-    
-    # Convert from Celsius to target
-    if to_unit == 'celsius':
-        result = celsius
-    elif to_unit == 'fahrenheit':
-        result = (celsius * 9.0 / 5.0) + 32
-    elif to_unit == 'kelvin':
-        result = celsius + 273.15
-    
-    return round(result, 4)
+    return convert('temperature', value, from_unit, to_unit)
 
 def convert_weight(value, from_unit, to_unit):
     """
@@ -123,18 +391,7 @@ def convert_weight(value, from_unit, to_unit):
     Raises:
         ValueError: If units are invalid
     """
-    from_unit = from_unit.lower()
-    to_unit = to_unit.lower()
-    
-    if from_unit not in WEIGHT_UNITS:
-        raise ValueError(f"Invalid source unit: {from_unit}")
-    if to_unit not in WEIGHT_UNITS:
-        raise ValueError(f"Invalid target unit: {to_unit}")
-    
-    # Convert to base unit (kg) then to target
-    kg = value * WEIGHT_UNITS[from_unit]
-    result = kg / WEIGHT_UNITS[to_unit]
-    return round(result, 6)
+    return convert('weight', value, from_unit, to_unit)
 
 def convert_time(value, from_unit, to_unit):
     """
@@ -151,27 +408,372 @@ def convert_time(value, from_unit, to_unit):
     Raises:
         ValueError: If units are invalid
     """
-    from_unit = from_unit.lower()
-    to_unit = to_unit.lower()
+    return convert('time', value, from_unit, to_unit)
+
+class ConversionCache:
+    """
+    Bounded, thread-safe LRU cache in front of convert()
     
-    if from_unit not in TIME_UNITS:
-        raise ValueError(f"Invalid source unit: {from_unit}")
-    if to_unit not in TIME_UNITS:
-        raise ValueError(f"Invalid target unit: {to_unit}")
+    Results are exactly what convert() returns (including the per-category
+    rounding); errors are never cached. Hits, misses and evictions are
+    counted for reporting.
+    """
+    
+    def __init__(self, maxsize=1024):
+        """
+        Args:
+            maxsize (int): Maximum number of cached conversions
+        """
+        if maxsize < 1:
+            raise ValueError("Cache size must be at least 1")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def convert(self, category, value, from_unit, to_unit):
+        """Same as convert(), served from the cache when possible"""
+        category, from_unit, to_unit = resolve_units(category, from_unit, to_unit)
+        key = (category, value, from_unit, to_unit)
+        with self._lock:
+            try:
+                result = self._entries[key]
+            except KeyError:
+                pass
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+        
+        result = convert(category, value, from_unit, to_unit)
+        
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return result
     
-    # Convert to base unit (seconds) then to target
-    seconds = value * TIME_UNITS[from_unit]
-    result = seconds / TIME_UNITS[to_unit]
-    return round(result, 6)
+    def stats(self):
+        """Get cache counters: size, maxsize, hits, misses, evictions and hit_rate"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+    
+    def clear(self):
+        """Drop all cached results and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
 
 # Quick reference dictionaries for menu display
-CATEGORY_UNITS = {
-    'length': list(LENGTH_UNITS.keys()),
-    'temperature': ['celsius', 'fahrenheit', 'kelvin'],
-    'weight': list(WEIGHT_UNITS.keys()),
-    'time': list(TIME_UNITS.keys())
-}
+CATEGORY_UNITS = REGISTRY['units']
 
 def get_available_units(category):
     """Get list of available units for a category"""
     return CATEGORY_UNITS.get(category.lower(), [])
+
+def get_categories():
+    """Get (category, label, menu hint) for every category, in menu order"""
+    return [(category, CATEGORY_LABELS[category], REGISTRY['hints'][category])
+            for category in REGISTRY['categories']]
+
+def _numpy():
+    """Import NumPy on first use; returns the module, or None if it is not installed"""
+    global np, _numpy_checked
+    if not _numpy_checked:
+        _numpy_checked = True
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        np = numpy
+    return np
+
+# Largest magnitude at which every float still has a fractional part
+_EXACT_INT_LIMIT = 2.0 ** 52
+
+# Most decimals _round_array() can round to: 10 ** ndigits must be exact
+_MAX_ARRAY_DIGITS = 22
+
+# Shortest list or tuple worth converting with NumPy (below this the
+# array round trip costs more than the Python loop)
+_VECTOR_MIN_LENGTH = 64
+
+def _round_array(values, ndigits):
+    """
+    Round a NumPy array exactly like the built-in round(x, ndigits)
+    
+    np.round scales by 10**ndigits before rounding, which can flip a value
+    that sits within one ulp of a half-way point, or lose precision on very
+    large magnitudes. Those few elements are re-rounded with round().
+    """
+    with np.errstate(over='ignore', invalid='ignore'):
+        scaled = values * (10.0 ** ndigits)
+        rounded = np.rint(scaled) / (10.0 ** ndigits)
+        fraction = np.abs(scaled - np.trunc(scaled))
+        suspect = np.abs(fraction - 0.5) <= np.spacing(np.abs(scaled))
+        suspect |= ~(np.abs(scaled) < _EXACT_INT_LIMIT)
+    
+    for i in np.flatnonzero(suspect):
+        rounded[i] = round(float(values[i]), ndigits)
+    return rounded
+
+def _round_results(values, ndigits, small):
+    """
+    Round a NumPy array of results exactly like convert() does
+    
+    Results below small are grouped by the number of decimals
+    _round_small() gives them, and each group is rounded in one pass.
+    """
+    rounded = _round_array(values, ndigits)
+    if not small:
+        return rounded
+    with np.errstate(invalid='ignore'):
+        tiny = np.flatnonzero((np.abs(values) < small) & (values != 0))
+    if not len(tiny):
+        return rounded
+    exponents = np.log10(np.abs(values[tiny])) - math.log10(small)
+    digits = ndigits - np.floor(exponents).astype(np.int64)
+    # Where log10 lands next to an integer, take math.log10's side of it
+    for i in np.flatnonzero(np.abs(exponents - np.rint(exponents)) < 1e-9):
+        digits[i] = ndigits - math.floor(math.log10(abs(float(values[tiny[i]]))) - math.log10(small))
+    for d in np.unique(digits):
+        chosen = tiny[digits == d]
+        if d > _MAX_ARRAY_DIGITS:
+            rounded[chosen] = [round(float(v), int(d)) for v in values[chosen]]
+        else:
+            rounded[chosen] = _round_array(values[chosen], int(d))
+    return rounded
+
+def _round_list(values, scale, divisor, offset, ndigits, small):
+    """The pure-Python batch kernel: convert() for each value, as a list"""
+    if not small:
+        return [round(v * scale / divisor + offset, ndigits) for v in values]
+    results = []
+    append = results.append
+    for v in values:
+        result = v * scale / divisor + offset
+        if -small < result < small:
+            append(_round_small(result, ndigits, small))
+        else:
+            append(round(result, ndigits))
+    return results
+
+@timed('convert_many')
+def convert_many(category, values, from_unit, to_unit):
+    """
+    Convert a batch of values between two units of the same category
+    
+    Units are resolved once for the whole batch. NumPy arrays, array.array
+    inputs and lists/tuples of at least _VECTOR_MIN_LENGTH numbers are
+    converted in a single vectorized pass when NumPy is installed; otherwise
+    a pure-Python loop is used. Every element gets exactly the result
+    convert() would return.
+    
+    Args:
+        category (str): Conversion category (see get_categories())
+        values (list | tuple | array.array | numpy.ndarray): Values to convert
+        from_unit (str): Source unit
+        to_unit (str): Target unit
+    
+    Returns:
+        Same kind of container as values, holding the converted floats
+        (array.array results use typecode 'd')
+    
+    Raises:
+        ValueError: If the category or units are invalid
+    """
+    scale, divisor, offset, ndigits, small = _coefficients(category, from_unit, to_unit)
+    
+    is_sequence = isinstance(values, (list, tuple))
+    if not is_sequence or len(values) >= _VECTOR_MIN_LENGTH:
+        _numpy()
+    if np is not None and isinstance(values, np.ndarray):
+        return _round_results(values.astype(np.float64) * scale / divisor + offset, ndigits, small)
+    
+    if is_sequence and np is not None and len(values) >= _VECTOR_MIN_LENGTH:
+        try:
+            data = np.asarray(values)
+        except (TypeError, ValueError):
+            data = None
+        # Only flat lists of plain numbers: anything else (huge ints,
+        # Decimals, strings, nested lists) goes through the loop below
+        if data is not None and data.ndim == 1 and data.dtype.kind in 'biuf':
+            results = _round_results(data.astype(np.float64) * scale / divisor + offset,
+                                     ndigits, small).tolist()
+            return tuple(results) if isinstance(values, tuple) else results
+    
+    if isinstance(values, array):
+        if np is not None:
+            data = np.frombuffer(values, dtype=values.typecode).astype(np.float64)
+            return array('d', _round_results(data * scale / divisor + offset, ndigits, small).tobytes())
+        return array('d', _round_list(values, scale, divisor, offset, ndigits, small))
+    
+    results = _round_list(values, scale, divisor, offset, ndigits, small)
+    if isinstance(values, tuple):
+        return tuple(results)
+    return results
+
+Quantity = namedtuple('Quantity', ['value', 'unit', 'category'])
+
+# One "<number><unit>" component: the unit is any run of non-space,
+# non-digit characters that does not start like a number
+_QUANTITY_TOKEN = re.compile(
+    r"\s*([-+]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?)\s*([^\s\d+\-.,][^\s\d]*)?\s*")
+
+# Alias -> (category, canonical unit) for category inference; aliases shared
+# by more than one category map to None, so they need an explicit category
+_SYMBOL_INDEX = REGISTRY['symbols']
+
+# Unit text as it appeared in input -> (category, canonical unit), filled on first use
+_unit_cache = {}
+
+def _lookup_unit(text, category):
+    """Resolve a unit string (with or without a known category), caching the answer"""
+    key = (text, category)
+    try:
+        return _unit_cache[key]
+    except KeyError:
+        pass
+    if category is None:
+        for candidate in (text, text.lower()):
+            if candidate in _SYMBOL_INDEX:
+                found = _SYMBOL_INDEX[candidate]
+                if found is None:
+                    raise ValueError(f"Ambiguous unit: {text} (give a category)")
+                break
+        else:
+            raise ValueError(f"Unknown unit: {text}")
+    else:
+        unit = resolve_unit(category, text)
+        if unit is None:
+            raise ValueError(f"Invalid unit for {category}: {text}")
+        found = (category, unit)
+    _memoize(_unit_cache, key, found)
+    return found
+
+def parse_quantity(text, category=None):
+    """
+    Parse a free-form quantity such as '12.5kg', '-40°F' or '5 ft 3 in'
+    
+    Compound quantities are added up in the unit of their first part
+    ('5 ft 3 in' -> 5.25 foot); a leading sign applies to the whole
+    quantity. Units may be any alias in units.json.
+    
+    Args:
+        text (str): Quantity text
+        category (str): Expected category; inferred from the unit when None
+    
+    Returns:
+        Quantity: (value, canonical unit, category)
+    
+    Raises:
+        ValueError: If the text is not a quantity or mixes categories
+    """
+    if category is not None:
+        category = category.lower()
+    
+    # Fast path: a single "<number><unit>" part
+    match = _QUANTITY_TOKEN.fullmatch(text)
+    if match is not None and match.group(2) is not None:
+        category, unit = _lookup_unit(match.group(2), category)
+        return Quantity(float(match.group(1)), unit, category)
+    
+    pos = 0
+    end = len(text)
+    parts = []
+    while pos < end:
+        match = _QUANTITY_TOKEN.match(text, pos)
+        if match is None or match.end() == pos:
+            raise ValueError(f"Cannot parse quantity: {text!r}")
+        number, unit_text = match.groups()
+        if unit_text is None:
+            raise ValueError(f"Missing unit in quantity: {text!r}")
+        if parts and number[0] in '+-':
+            raise ValueError(f"Only the first part of a quantity may have a sign: {text!r}")
+        parts.append((float(number), unit_text))
+        pos = match.end()
+    if not parts:
+        raise ValueError("Please enter a quantity.")
+    
+    value, unit_text = parts[0]
+    category, unit = _lookup_unit(unit_text, category)
+    if len(parts) == 1:
+        return Quantity(value, unit, category)
+    
+    if category == 'temperature':
+        raise ValueError(f"Temperatures cannot be compound: {text!r}")
+    total = abs(value)
+    for part_value, part_unit in parts[1:]:
+        _, part_unit = _lookup_unit(part_unit, category)
+        scale, divisor, *_ = CONVERSION_TABLE[(category, part_unit, unit)]
+        total += part_value * scale / divisor
+    return Quantity(math.copysign(total, value), unit, category)
+
+def parse_many(texts, category=None, to_unit=None, skip_errors=False):
+    """
+    Parse many quantity strings, optionally converting them on the way
+    
+    Unit strings are resolved once and cached, so repeated units cost one
+    dictionary hit; with to_unit each item is converted with the same
+    kernel and rounding as convert().
+    
+    Args:
+        texts (iterable): Quantity strings
+        category (str): Expected category; inferred per item when None
+        to_unit (str): Convert every quantity to this unit
+        skip_errors (bool): Put None in place of unparseable items instead of raising
+    
+    Returns:
+        list: Quantity tuples, or converted floats when to_unit is given
+    
+    Raises:
+        ValueError: For the first bad item (with its index) unless skip_errors
+    """
+    if category is not None:
+        category = category.lower()
+        if to_unit is not None and resolve_unit(category, to_unit) is None:
+            raise ValueError(f"Invalid target unit: {to_unit}")
+    results = []
+    append = results.append
+    coefficients = {}
+    fullmatch = _QUANTITY_TOKEN.fullmatch
+    for i, text in enumerate(texts):
+        try:
+            # Single-part quantities are handled inline; compound ones go through parse_quantity
+            match = fullmatch(text)
+            if match is not None and match.group(2) is not None:
+                value = float(match.group(1))
+                item_category, unit = _lookup_unit(match.group(2), category)
+            else:
+                value, unit, item_category = parse_quantity(text, category)
+            if to_unit is None:
+                append(Quantity(value, unit, item_category))
+                continue
+            key = (item_category, unit)
+            entry = coefficients.get(key)
+            if entry is None:
+                entry = coefficients[key] = _coefficients(item_category, unit, to_unit)
+            scale, divisor, offset, ndigits, small = entry
+            result = value * scale / divisor + offset
+            if -small < result < small:
+                append(_round_small(result, ndigits, small))
+            else:
+                append(round(result, ndigits))
+        except ValueError as e:
+            if not skip_errors:
+                raise ValueError(f"Item {i}: {e}") from None
+            append(None)
+    return results
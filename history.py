@@ -5,25 +5,234 @@ Author: [Your Name]
 Date: November 24, 2025
 """
 
+from collections import deque
 from datetime import datetime
 import json
 import os
+import time
+
+from history_analytics import (HISTOGRAM_BINS, TOP_PAIRS, analyze, format_report, records_to_columns,
+                               scaled_bar)
+from history_export import export_history
+from locking import FileLock, atomic_write, file_replaced
+from metrics import timed
+
+class RollingCounter:
+    """Counts events in a sliding time window using fixed-width time buckets"""
+    
+    def __init__(self, span, bucket):
+        """
+        Args:
+            span (int): Window length in seconds
+            bucket (int): Bucket width in seconds (the window's resolution)
+        """
+        self.span = span
+        self.bucket = bucket
+        self.buckets = deque()  # [bucket_start, count], oldest first
+        self.total = 0
+    
+    def add(self, when, count=1):
+        """Record count events at epoch time when (a negative count removes them)"""
+        start = int(when // self.bucket) * self.bucket
+        if self.buckets and self.buckets[-1][0] == start:
+            self.buckets[-1][1] += count
+        elif self.buckets and self.buckets[-1][0] > start:
+            # Older than the newest bucket (e.g. while loading history)
+            for entry in reversed(self.buckets):
+                if entry[0] <= start:
+                    break
+            if entry[0] == start:
+                entry[1] += count
+            else:
+                return
+        else:
+            self.buckets.append([start, count])
+        self.total += count
+    
+    def count(self, now=None):
+        """Events within the last span seconds"""
+        now = time.time() if now is None else now
+        horizon = now - self.span
+        while self.buckets and self.buckets[0][0] + self.bucket <= horizon:
+            self.total -= self.buckets.popleft()[1]
+        return self.total
+    
+    def clear(self):
+        self.buckets.clear()
+        self.total = 0
+
+# Unit and category names are stored once here; records only hold their ids
+_names = []
+_name_ids = {}
+
+def name_id(name):
+    """Return the small integer id of a unit/category name, assigning one if new"""
+    try:
+        return _name_ids[name]
+    except KeyError:
+        _name_ids[name] = len(_names)
+        _names.append(name)
+        return _name_ids[name]
+
+def name_of(ident):
+    """Return the unit/category name for an id from name_id()"""
+    return _names[ident]
+
+class ConversionRecord:
+    """One conversion: epoch timestamp, numbers and unit/category ids"""
+    
+    __slots__ = ('timestamp', 'category_id', 'value', 'from_id', 'to_id', 'result')
+    
+    def __init__(self, timestamp, category, value, from_unit, to_unit, result):
+        self.timestamp = timestamp
+        self.category_id = name_id(category.lower())
+        self.value = float(value)
+        self.from_id = name_id(from_unit)
+        self.to_id = name_id(to_unit)
+        self.result = float(result)
+    
+    @property
+    def category(self):
+        return _names[self.category_id]
+    
+    @property
+    def from_unit(self):
+        return _names[self.from_id]
+    
+    @property
+    def to_unit(self):
+        return _names[self.to_id]
+    
+    def time_text(self):
+        """Timestamp formatted for display"""
+        return datetime.fromtimestamp(self.timestamp).strftime("%Y-%m-%d %H:%M:%S")
+    
+    def conversion_text(self):
+        """Conversion formatted for display, e.g. '1.0 foot → 0.3048 meter'"""
+        return f"{self.value} {self.from_unit} → {self.result} {self.to_unit}"
+    
+    def to_dict(self):
+        """Compact form used for persistence"""
+        return {
+            'ts': self.timestamp,
+            'category': self.category,
+            'value': self.value,
+            'from': self.from_unit,
+            'to': self.to_unit,
+            'result': self.result
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build a record from its persisted form
+        
+        Also accepts the older format with preformatted 'input'/'output'
+        strings (e.g. '100.0 meter') and a text timestamp.
+        
+        Raises:
+            KeyError, ValueError: If the entry is malformed
+        """
+        if 'ts' in data:
+            return cls(data['ts'], data['category'], data['value'], data['from'], data['to'],
+                       data['result'])
+        
+        value, from_unit = data['input'].rsplit(' ', 1)
+        result, to_unit = data['output'].rsplit(' ', 1)
+        timestamp = datetime.strptime(data['timestamp'], "%Y-%m-%d %H:%M:%S").timestamp()
+        return cls(timestamp, data['category'], value, from_unit, to_unit, result)
+
+class RingBuffer:
+    """Fixed-capacity buffer of the most recent items; appending never copies"""
+    
+    def __init__(self, capacity):
+        self._items = [None] * capacity
+        self._start = 0
+        self._len = 0
+    
+    def append(self, item):
+        """Add an item; returns the item evicted to make room (or None)"""
+        capacity = len(self._items)
+        if capacity == 0:
+            return item
+        if self._len < capacity:
+            self._items[(self._start + self._len) % capacity] = item
+            self._len += 1
+            return None
+        evicted = self._items[self._start]
+        self._items[self._start] = item
+        self._start = (self._start + 1) % capacity
+        return evicted
+    
+    def tail(self, n):
+        """The n most recent items, oldest first"""
+        n = max(0, min(n, self._len))
+        capacity = len(self._items)
+        first = self._start + self._len - n
+        return [self._items[(first + i) % capacity] for i in range(n)]
+    
+    def clear(self):
+        self._items = [None] * len(self._items)
+        self._start = 0
+        self._len = 0
+    
+    def __len__(self):
+        return self._len
+    
+    def __iter__(self):
+        return iter(self.tail(self._len))
+
+def _file_stamp(filename):
+    """(inode, size, mtime) of a file, or None - changes whenever the file is rewritten"""
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
 
 class ConversionHistory:
     """Manages conversion history with file persistence"""
     
-    def __init__(self, max_entries=20, filename='conversion_history.json'):
+    def __init__(self, max_entries=20, filename='conversion_history.json', journal=False,
+                 compact_every=None, flush_every=1):
         """
         Initialize history manager
         
         Args:
             max_entries (int): Maximum number of history entries to keep
             filename (str): File to store history
+            journal (bool): Store history as an append-only JSONL journal
+                            (<filename>.jsonl) instead of rewriting the JSON file
+            compact_every (int): Journal lines appended before the journal is
+                                 compacted to the last max_entries (default: max_entries)
+            flush_every (int): Conversions buffered before they are written out
+                               (flush() and close() write any that are pending)
+        
+        The history file is not read here but on first use, so creating a
+        history costs nothing until it is actually needed.
         """
         self.max_entries = max_entries
         self.filename = filename
-        self.history = []
-        self.load_from_file()
+        self.journal = journal
+        self.journal_filename = os.path.splitext(filename)[0] + '.jsonl'
+        self.compact_every = compact_every or max_entries
+        self.flush_every = flush_every
+        self._journal_file = None
+        self._journal_lines = 0
+        self._unsaved = []
+        self._file_stamp = None
+        self._lock = FileLock(self.journal_filename if journal else filename)
+        self.history = RingBuffer(max_entries)
+        self._category_counts = {}
+        self._pair_counts = {}
+        self._last_hour = RollingCounter(3600, 60)
+        self._last_day = RollingCounter(86400, 900)
+        self._loaded = False
+    
+    def _ensure_loaded(self):
+        """Load the history file the first time the history is used"""
+        if not self._loaded:
+            self.load_from_file()
     
     def add_conversion(self, category, value, from_unit, to_unit, result):
         """
@@ -36,21 +245,12 @@ class ConversionHistory:
             to_unit (str): Target unit
             result (float): Conversion result
         """
-        entry = {
-            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            'category': category.capitalize(),
-            'input': f"{value} {from_unit}",
-            'output': f"{result} {to_unit}",
-            'conversion': f"{value} {from_unit} → {result} {to_unit}"
-        }
-        
-        self.history.append(entry)
-        
-        # Keep only most recent entries
-        if len(self.history) > self.max_entries:
-            self.history = self.history[-self.max_entries:]
-        
-        self.save_to_file()
+        self._ensure_loaded()
+        entry = ConversionRecord(time.time(), category, value, from_unit, to_unit, result)
+        self._push(entry)
+        self._unsaved.append(entry)
+        if len(self._unsaved) >= self.flush_every:
+            self.flush()
     
     def display_history(self, limit=10):
         """
@@ -59,41 +259,125 @@ class ConversionHistory:
         Args:
             limit (int): Number of recent entries to show
         """
-        if not self.history:
+        recent = self.recent(limit)
+        if not recent:
             print("\n📋 No conversion history available.")
             print("   Perform some conversions to see history here!\n")
             return
         
-        recent = self.history[-limit:]
         
         print("\n" + "="*70)
         print(f"📋 CONVERSION HISTORY (Last {len(recent)} entries)")
         print("="*70)
         
         for i, entry in enumerate(reversed(recent), 1):
-            print(f"\n{i}. 🕐 {entry['timestamp']}")
-            print(f"   📂 Category: {entry['category']}")
-            print(f"   🔄 Conversion: {entry['conversion']}")
+            print(f"\n{i}. 🕐 {entry.time_text()}")
+            print(f"   📂 Category: {entry.category.capitalize()}")
+            print(f"   🔄 Conversion: {entry.conversion_text()}")
         
         print("\n" + "="*70)
     
+    def recent(self, limit):
+        """The last limit records, oldest first"""
+        self._ensure_loaded()
+        return self.history.tail(limit)
+    
+    def entries(self):
+        """Iterate over all records, oldest first"""
+        self._ensure_loaded()
+        return iter(self.history)
+    
+    def __len__(self):
+        self._ensure_loaded()
+        return len(self.history)
+    
     def get_statistics(self):
-        """Get statistics about conversion usage"""
+        """
+        Get statistics about conversion usage
+        
+        Counts (including the last hour/day windows) cover the entries kept
+        in history and are maintained incrementally by add_conversion,
+        trimming and clear_history, so this never walks the history.
+        """
+        self._ensure_loaded()
         if not self.history:
             return None
         
-        # Count conversions by category
-        category_counts = {}
-        for entry in self.history:
-            cat = entry['category']
-            category_counts[cat] = category_counts.get(cat, 0) + 1
+        by_category = {name_of(cat).capitalize(): count for cat, count in self._category_counts.items()}
+        by_unit_pair = {f"{name_of(src)} → {name_of(dst)}": count
+                        for (src, dst), count in self._pair_counts.items()}
         
         return {
             'total_conversions': len(self.history),
-            'by_category': category_counts,
-            'most_used': max(category_counts.items(), key=lambda x: x[1])[0]
+            'by_category': by_category,
+            'most_used': max(by_category.items(), key=lambda x: x[1])[0],
+            'by_unit_pair': by_unit_pair,
+            'most_used_pair': max(by_unit_pair.items(), key=lambda x: x[1])[0],
+            'last_hour': self._last_hour.count(),
+            'last_day': self._last_day.count()
         }
     
+    def columns(self):
+        """History as (names, columns) for columnar analytics (see history_analytics)"""
+        return records_to_columns(self.entries())
+    
+    def get_analytics(self, top=TOP_PAIRS, bins=HISTOGRAM_BINS):
+        """
+        Value distributions, top unit pairs and throughput over the whole history
+        
+        Args:
+            top (int): Number of (from, to) pairs to rank
+            bins (int): Histogram bins per unit
+        
+        Returns:
+            dict: See history_analytics.analyze, or None if history is empty
+        """
+        if len(self) == 0:
+            return None
+        names, columns = self.columns()
+        return analyze(names, columns, top=top, bins=bins)
+    
+    def _push(self, entry):
+        """Append a record to the ring buffer, keeping the counters in step"""
+        self._count_entry(entry, 1)
+        evicted = self.history.append(entry)
+        if evicted is not None:
+            self._count_entry(evicted, -1)
+    
+    def _count_entry(self, entry, delta):
+        """Add (delta=1) or remove (delta=-1) an entry from the running counters"""
+        pair = (entry.from_id, entry.to_id)
+        for counts, key in ((self._category_counts, entry.category_id), (self._pair_counts, pair)):
+            count = counts.get(key, 0) + delta
+            if count > 0:
+                counts[key] = count
+            else:
+                counts.pop(key, None)
+        self._last_hour.add(entry.timestamp, delta)
+        self._last_day.add(entry.timestamp, delta)
+    
+    def _reset(self, entries=()):
+        """Replace the history (and its counters) with the given records"""
+        self._loaded = True
+        self.history.clear()
+        self._category_counts = {}
+        self._pair_counts = {}
+        self._last_hour.clear()
+        self._last_day.clear()
+        for entry in entries:
+            self._push(entry)
+    
+    @staticmethod
+    def _parse_entries(items):
+        """Convert persisted dicts into records, skipping malformed ones"""
+        entries = []
+        for item in items:
+            try:
+                entries.append(ConversionRecord.from_dict(item))
+            except (KeyError, TypeError, ValueError, AttributeError):
+                continue
+        return entries
+    
     def display_statistics(self):
         """Display usage statistics"""
         stats = self.get_statistics()
@@ -107,55 +391,273 @@ class ConversionHistory:
         print("="*70)
         print(f"\n🔢 Total Conversions: {stats['total_conversions']}")
         print(f"⭐ Most Used Category: {stats['most_used']}")
+        print(f"🔁 Most Used Unit Pair: {stats['most_used_pair']}")
+        print(f"🕐 Last Hour: {stats['last_hour']}   Last Day: {stats['last_day']}")
         print("\n📂 Conversions by Category:")
         
+        # Two blocks per conversion, scaled down once the longest bar would pass 40
+        largest = max(stats['by_category'].values())
+        width = min(largest * 2, 40)
         for category, count in sorted(stats['by_category'].items()):
-            bar = "█" * (count * 2)
+            bar = scaled_bar(count, largest, width)
             print(f"   {category:15s} : {bar} ({count})")
         
+        analytics = self.get_analytics()
+        if analytics:
+            print("\n📈 Analytics:")
+            for line in format_report(analytics, max_units=5, histograms=1, hours=12, days=7):
+                print(("   " + line).rstrip())
+        
         print("\n" + "="*70)
     
     def clear_history(self):
         """Clear all conversion history"""
-        self.history = []
+        self._reset()
         self.save_to_file()
         print("\n✅ Conversion history cleared successfully!\n")
     
+    def flush(self):
+        """
+        Write conversions added since the last flush
+        
+        Other processes may be writing the same history: the journal is
+        appended to under a file lock, and in JSON mode the file is re-read
+        under the lock (when another process changed it) and these
+        conversions merged in before it is atomically replaced.
+        """
+        if not self._unsaved:
+            return
+        if self.journal:
+            self._append_journal()
+        else:
+            self._merge_into_file()
+    
+    @timed('save_to_file')
     def save_to_file(self):
-        """Save history to JSON file"""
+        """
+        Replace the stored history with this process's copy of it
+        
+        Used after clear_history; new conversions are written by flush().
+        """
+        self._ensure_loaded()
+        self._unsaved = []
+        if self.journal:
+            self._compact_journal(reload=False)
+            return
         try:
-            with open(self.filename, 'w') as f:
-                json.dump(self.history, f, indent=2)
+            with self._lock:
+                atomic_write(self.filename, self._json_text(self.history))
+                self._file_stamp = _file_stamp(self.filename)
         except Exception as e:
             print(f"⚠️  Warning: Could not save history: {e}")
     
+    @timed('load_from_file')
     def load_from_file(self):
-        """Load history from JSON file"""
-        if os.path.exists(self.filename):
-            try:
-                with open(self.filename, 'r') as f:
-                    self.history = json.load(f)
-            except Exception as e:
-                print(f"⚠️  Warning: Could not load history: {e}")
-                self.history = []
+        """Load history from JSON file (or from the journal in journal mode)"""
+        self._loaded = True
+        if self.journal:
+            self._load_journal()
+            return
+        try:
+            with self._lock:
+                self._reset(self._read_json(self.filename))
+                self._file_stamp = _file_stamp(self.filename)
+        except Exception as e:
+            print(f"⚠️  Warning: Could not load history: {e}")
+            self._reset()
+    
+    def close(self):
+        """Write pending conversions, then compact the journal and close it"""
+        if not self._loaded:
+            return
+        self.flush()
+        if self.journal:
+            self._compact_journal()
+            if self._journal_file:
+                self._journal_file.close()
+                self._journal_file = None
+        self._lock.close()
+    
+    @staticmethod
+    def _json_text(entries):
+        return json.dumps([entry.to_dict() for entry in entries], indent=2)
+    
+    def _read_json(self, filename):
+        """
+        Records stored in a JSON history file ([] if there is none)
+        
+        An unreadable file is moved aside to <filename>.corrupt, with a
+        warning, instead of being overwritten by the next save.
+        """
+        if not os.path.exists(filename):
+            return []
+        try:
+            with open(filename, 'r') as f:
+                return self._parse_entries(json.load(f))
+        except ValueError as e:
+            print(f"⚠️  Warning: Could not load history ({e}); moved it to {filename}.corrupt")
+            os.replace(filename, filename + '.corrupt')
+            return []
+    
+    @timed('save_to_file')
+    def _merge_into_file(self):
+        """Add unsaved conversions to the JSON file, keeping what other processes wrote"""
+        try:
+            with self._lock:
+                if _file_stamp(self.filename) != self._file_stamp:
+                    # Changed by another process since this one last read or wrote it
+                    entries = (self._read_json(self.filename) + self._unsaved)[-self.max_entries:]
+                    self._reset(entries)
+                atomic_write(self.filename, self._json_text(self.history))
+                self._file_stamp = _file_stamp(self.filename)
+                self._unsaved = []
+        except Exception as e:
+            print(f"⚠️  Warning: Could not save history: {e}")
+    
+    def _load_journal(self):
+        """
+        Load history from the JSONL journal
+        
+        On first use the existing JSON history file is migrated into the
+        journal. Unreadable lines (e.g. a write torn by a crash) are dropped.
+        """
+        try:
+            with self._lock:
+                if not os.path.exists(self.journal_filename):
+                    self._reset(self._read_json(self.filename))
+                    self._compact_journal(reload=False)
+                    return
+                entries, lines, damaged = self._read_journal()
+                self._reset(entries)
+                self._journal_lines = lines
+                
+                # Rewrite a damaged journal so new lines don't append to a torn one
+                if damaged:
+                    self._compact_journal(reload=False)
+        except Exception as e:
+            print(f"⚠️  Warning: Could not load history: {e}")
+            self._reset()
+    
+    def _read_journal(self):
+        """Read the journal: (last max_entries records, valid lines, damaged flag)"""
+        entries = deque(maxlen=self.max_entries)
+        lines = 0
+        damaged = False
+        try:
+            with open(self.journal_filename, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entries.append(ConversionRecord.from_dict(json.loads(line)))
+                        lines += 1
+                    except (KeyError, TypeError, ValueError, AttributeError):
+                        damaged = True
+        except FileNotFoundError:
+            pass
+        return entries, lines, damaged
+    
+    @timed('append_journal')
+    def _append_journal(self):
+        """Append unsaved conversions to the journal in one write, compacting it when it grows too long"""
+        text = ''.join(json.dumps(entry.to_dict()) + '\n' for entry in self._unsaved)
+        try:
+            with self._lock:
+                # Reopen if another process compacted (replaced) the journal
+                if self._journal_file is None or file_replaced(self._journal_file, self.journal_filename):
+                    if self._journal_file:
+                        self._journal_file.close()
+                    self._journal_file = open(self.journal_filename, 'a', encoding='utf-8')
+                self._journal_file.write(text)
+                self._journal_file.flush()
+                self._journal_lines += len(self._unsaved)
+                self._unsaved = []
+                
+                if self._journal_lines >= self.max_entries + self.compact_every:
+                    self._compact_journal()
+        except Exception as e:
+            print(f"⚠️  Warning: Could not save history: {e}")
+    
+    def _compact_journal(self, reload=True):
+        """
+        Rewrite the journal with only the last max_entries records
+        
+        With reload the journal is re-read under the lock first, so lines
+        appended by other processes are kept (along with any of this
+        process's conversions not yet written); otherwise this process's
+        in-memory history is written as it is.
+        """
+        try:
+            with self._lock:
+                if self._journal_file:
+                    self._journal_file.close()
+                    self._journal_file = None
+                if reload:
+                    entries, _, _ = self._read_journal()
+                    self._reset(list(entries) + self._unsaved)
+                    self._unsaved = []
+                atomic_write(self.journal_filename,
+                             ''.join(json.dumps(entry.to_dict()) + '\n' for entry in self.history))
+                self._journal_lines = len(self.history)
+        except Exception as e:
+            print(f"⚠️  Warning: Could not save history: {e}")
+    
+    def export(self, filename, fmt=None):
+        """
+        Export history as CSV, JSONL or compact binary (see history_export)
+        
+        Records are streamed from entries() in chunks, so any backend can be
+        exported in constant memory.
+        
+        Args:
+            filename (str): Output file
+            fmt (str): 'csv', 'jsonl' or 'bin' (default: from the extension)
+        
+        Returns:
+            int: Number of conversions exported, or None on error
+        """
+        try:
+            rows = export_history(self.entries(), filename, fmt)
+        except (OSError, ValueError) as e:
+            print(f"\n❌ Error exporting history: {e}\n")
+            return None
+        print(f"\n✅ {rows} conversions exported to '{filename}' successfully!\n")
+        return rows
+    
+    def export_analytics(self, filename, top=TOP_PAIRS, bins=HISTOGRAM_BINS):
+        """
+        Write get_analytics() to a JSON file
+        
+        Returns:
+            bool: True if the report was written
+        """
+        report = self.get_analytics(top, bins)
+        if report is None:
+            print("\n❌ No history to analyze.\n")
+            return False
+        try:
+            atomic_write(filename, json.dumps(report, indent=2, ensure_ascii=False))
+        except OSError as e:
+            print(f"\n❌ Error exporting analytics: {e}\n")
+            return False
+        print(f"\n✅ Analytics for {report['total']} conversions exported to '{filename}' successfully!\n")
+        return True
     
     def export_to_text(self, filename='history_export.txt'):
         """Export history to readable text file"""
-        if not self.history:
+        if len(self) == 0:
             print("\n❌ No history to export.\n")
             return
         
         try:
-            with open(filename, 'w') as f:
+            with open(filename, 'w', encoding='utf-8') as f:
                 f.write("UNIT CONVERTER - CONVERSION HISTORY\n")
                 f.write("="*70 + "\n")
                 f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
                 f.write("="*70 + "\n\n")
                 
-                for i, entry in enumerate(self.history, 1):
-                    f.write(f"{i}. [{entry['timestamp']}]\n")
-                    f.write(f"   Category: {entry['category']}\n")
-                    f.write(f"   Conversion: {entry['conversion']}\n\n")
+                for i, entry in enumerate(self.entries(), 1):
+                    f.write(f"{i}. [{entry.time_text()}]\n")
+                    f.write(f"   Category: {entry.category.capitalize()}\n")
+                    f.write(f"   Conversion: {entry.conversion_text()}\n\n")
                 
                 # Add statistics
                 stats = self.get_statistics()
@@ -164,10 +666,21 @@ class ConversionHistory:
                     f.write("STATISTICS\n")
                     f.write("="*70 + "\n")
                     f.write(f"Total Conversions: {stats['total_conversions']}\n")
-                    f.write(f"Most Used Category: {stats['most_used']}\n\n")
+                    f.write(f"Most Used Category: {stats['most_used']}\n")
+                    f.write(f"Most Used Unit Pair: {stats['most_used_pair']}\n")
+                    f.write(f"Last Hour: {stats['last_hour']}  Last Day: {stats['last_day']}\n\n")
                     f.write("By Category:\n")
                     for cat, count in sorted(stats['by_category'].items()):
                         f.write(f"  - {cat}: {count}\n")
+                
+                analytics = self.get_analytics()
+                if analytics:
+                    f.write("\n" + "="*70 + "\n")
+                    f.write("ANALYTICS\n")
+                    f.write("="*70 + "\n")
+                    for line in format_report(analytics, max_units=None, histograms=None,
+                                              hours=None, days=None):
+                        f.write(line + "\n")
             
             print(f"\n✅ History exported to '{filename}' successfully!\n")
         
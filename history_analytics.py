@@ -0,0 +1,351 @@
+"""
+History Analytics Module
+Columnar, vectorized statistics over conversion history
+Author: [Your Name]
+Date: November 24, 2025
+
+History is analyzed as columns, in the (names, columns) layout returned
+by history_export.read_binary: float64 'ts', 'value' and 'result' arrays
+and integer 'category', 'from' and 'to' arrays indexing a list of names.
+With NumPy every statistic is a vectorized pass (bincount for counts, one
+stable argsort to group values by unit); without it the same report is
+built in a single Python loop.
+"""
+
+from array import array
+from collections import Counter
+from datetime import datetime
+import math
+import time
+
+import converter
+
+PERCENTILES = (50, 90, 95, 99)
+HISTOGRAM_BINS = 10
+TOP_PAIRS = 10
+
+# Largest table counted with bincount before falling back to sorting
+_BINCOUNT_LIMIT = 1 << 24
+
+def rows_to_columns(rows):
+    """
+    Collect (ts, category, value, from, to, result) tuples into columns
+
+    Args:
+        rows (iterable): Tuples in ConversionRecord constructor order
+
+    Returns:
+        tuple: (names, columns) as described in the module docstring
+    """
+    names = []
+    index = {}
+    columns = {'ts': array('d'), 'value': array('d'), 'result': array('d'),
+               'category': array('H'), 'from': array('H'), 'to': array('H')}
+    ts_column, value_column, result_column = columns['ts'], columns['value'], columns['result']
+    id_columns = (columns['category'], columns['from'], columns['to'])
+
+    for ts, category, value, from_unit, to_unit, result in rows:
+        ts_column.append(ts)
+        value_column.append(value)
+        result_column.append(result)
+        for column, name in zip(id_columns, (category, from_unit, to_unit)):
+            ident = index.get(name)
+            if ident is None:
+                ident = index[name] = len(names)
+                names.append(name)
+            column.append(ident)
+    return names, columns
+
+def records_to_columns(records):
+    """Collect ConversionRecord objects into (names, columns)"""
+    return rows_to_columns((r.timestamp, r.category, r.value, r.from_unit, r.to_unit, r.result)
+                           for r in records)
+
+def _utc_offset():
+    """Seconds to add to a Unix timestamp to get local wall-clock time"""
+    return datetime.now().astimezone().utcoffset().total_seconds()
+
+def summarize(names, columns, now=None):
+    """
+    The get_statistics() dictionary computed from columns
+
+    Args:
+        names (list): Dictionary of category/unit names
+        columns (dict): Columns as described in the module docstring
+        now (float): Reference time for the last hour/day counts
+
+    Returns:
+        dict: Same keys as ConversionHistory.get_statistics, or None if empty
+    """
+    total = len(columns['ts'])
+    if not total:
+        return None
+    now = time.time() if now is None else now
+    np = converter._numpy()
+
+    if np is not None:
+        ts = np.asarray(columns['ts'])
+        categories = np.bincount(np.asarray(columns['category']), minlength=len(names))
+        pairs = _pair_counts(np, columns, len(names))
+        last_hour = int(np.count_nonzero(ts >= now - 3600))
+        last_day = int(np.count_nonzero(ts >= now - 86400))
+        by_category = {names[c].capitalize(): int(categories[c]) for c in np.flatnonzero(categories)}
+        by_unit_pair = {f"{names[s]} → {names[d]}": n for (s, d), n in pairs}
+    else:
+        category_counts = Counter(columns['category'])
+        pair_counts = Counter(zip(columns['from'], columns['to']))
+        last_hour = sum(1 for ts in columns['ts'] if ts >= now - 3600)
+        last_day = sum(1 for ts in columns['ts'] if ts >= now - 86400)
+        by_category = {names[c].capitalize(): n for c, n in category_counts.items()}
+        by_unit_pair = {f"{names[s]} → {names[d]}": n for (s, d), n in pair_counts.items()}
+
+    return {
+        'total_conversions': total,
+        'by_category': by_category,
+        'most_used': max(by_category.items(), key=lambda x: x[1])[0],
+        'by_unit_pair': by_unit_pair,
+        'most_used_pair': max(by_unit_pair.items(), key=lambda x: x[1])[0],
+        'last_hour': last_hour,
+        'last_day': last_day
+    }
+
+def analyze(names, columns, top=TOP_PAIRS, bins=HISTOGRAM_BINS, percentiles=PERCENTILES):
+    """
+    Value distributions, top unit pairs and throughput over whole columns
+
+    Input values are grouped by source unit; non-finite values are left out
+    of the distributions. Percentiles interpolate linearly between the
+    nearest values (NumPy's default). Throughput is counted per local
+    clock hour and day.
+
+    Args:
+        names (list): Dictionary of category/unit names
+        columns (dict): Columns as described in the module docstring
+        top (int): Number of (from, to) pairs to rank
+        bins (int): Histogram bins per unit
+        percentiles (tuple): Percentiles of the input values to report
+
+    Returns:
+        dict: total; units (per source unit, most used first: count, min,
+              max, mean, percentiles, histogram edges and counts);
+              top_pairs; hourly and daily ({'start', 'count'} buckets,
+              oldest first); peak_hour and peak_day. None if there is no
+              history.
+    """
+    total = len(columns['ts'])
+    if not total:
+        return None
+    offset = _utc_offset()
+    np = converter._numpy()
+    if np is not None:
+        units, pairs, hours = _analyze_numpy(np, names, columns, top, bins, percentiles, offset)
+    else:
+        units, pairs, hours = _analyze_python(names, columns, top, bins, percentiles, offset)
+
+    days = Counter()
+    for hour, count in hours:
+        days[hour // 24] += count
+    hourly = [{'start': hour * 3600 - offset, 'count': count} for hour, count in hours]
+    daily = [{'start': day * 86400 - offset, 'count': count} for day, count in sorted(days.items())]
+    return {
+        'total': total,
+        'units': units,
+        'top_pairs': [{'from': names[s], 'to': names[d], 'count': n} for (s, d), n in pairs],
+        'hourly': hourly,
+        'daily': daily,
+        'peak_hour': max(hourly, key=lambda b: b['count']),
+        'peak_day': max(daily, key=lambda b: b['count'])
+    }
+
+def _unit_stats(name, count, low, high, mean, quantiles, percentiles, edges, counts):
+    return {
+        'unit': name,
+        'count': count,
+        'min': float(low),
+        'max': float(high),
+        'mean': float(mean),
+        'percentiles': {f"p{p}": float(q) for p, q in zip(percentiles, quantiles)},
+        'histogram': {'edges': [float(e) for e in edges], 'counts': [int(c) for c in counts]}
+    }
+
+def _pair_counts(np, columns, n):
+    """[((from, to), count)] for every pair that occurs, most frequent first"""
+    src = np.asarray(columns['from']).astype(np.int64)
+    dst = np.asarray(columns['to']).astype(np.int64)
+    codes = src * n + dst
+    if n * n <= _BINCOUNT_LIMIT:
+        counts = np.bincount(codes, minlength=n * n)
+        present = np.flatnonzero(counts)
+        counts = counts[present]
+    else:
+        present, counts = np.unique(codes, return_counts=True)
+    order = np.argsort(-counts, kind='stable')
+    return [((int(present[i]) // n, int(present[i]) % n), int(counts[i])) for i in order]
+
+def _analyze_numpy(np, names, columns, top, bins, percentiles, offset):
+    ts = np.asarray(columns['ts'], dtype=np.float64)
+    values = np.asarray(columns['value'], dtype=np.float64)
+    src = np.asarray(columns['from'])
+
+    # Group finite values by source unit (a stable sort of small integers
+    # is a radix sort); percentiles then only partition each group
+    finite = np.isfinite(values)
+    if not finite.all():
+        values = values[finite]
+        src = src[finite]
+    grouped = values[np.argsort(src, kind='stable')]
+    sizes = np.bincount(src, minlength=len(names))
+    ends = np.cumsum(sizes)
+    units = []
+    for unit in np.flatnonzero(sizes):
+        group = grouped[ends[unit] - sizes[unit]:ends[unit]]
+        low, high = group.min(), group.max()
+        mean, quantiles, edges, counts = _numpy_distribution(np, group, low, high, bins, percentiles)
+        units.append(_unit_stats(names[unit], len(group), low, high, mean,
+                                 quantiles, percentiles, edges, counts))
+    units.sort(key=lambda u: (-u['count'], u['unit']))
+
+    pairs = _pair_counts(np, columns, len(names))[:top]
+
+    buckets = np.floor((ts + offset) / 3600).astype(np.int64)
+    first = int(buckets.min())
+    span = int(buckets.max()) - first + 1
+    if span <= _BINCOUNT_LIMIT:
+        counts = np.bincount(buckets - first)
+        present = np.flatnonzero(counts)
+        hours = [(int(h) + first, int(counts[h])) for h in present]
+    else:
+        present, counts = np.unique(buckets, return_counts=True)
+        hours = [(int(h), int(c)) for h, c in zip(present, counts)]
+    return units, pairs, hours
+
+def _numpy_distribution(np, group, low, high, bins, percentiles):
+    """(mean, quantiles, edges, counts) of one unit's finite values with NumPy"""
+    with np.errstate(over='ignore'):
+        # A range wider than the largest float (-1e308 to 1e308) is binned
+        # and interpolated at half scale, where it fits
+        halve = not np.isfinite(high - low)
+        mean = group.sum() / len(group)
+    if not np.isfinite(mean):
+        mean = (group / len(group)).sum()
+    scaled = group / 2 if halve else group
+    quantiles = np.percentile(scaled, percentiles)
+    try:
+        counts, edges = np.histogram(scaled, bins=bins)
+    except ValueError:
+        # No room for the bins (equal values too large to widen by ±0.5)
+        return mean, quantiles * 2 if halve else quantiles, [low, high], [len(group)]
+    if halve:
+        quantiles, edges = quantiles * 2, edges * 2
+    return mean, quantiles, edges, counts
+
+def _percentile(ordered, p):
+    """Linearly interpolated percentile of a sorted list"""
+    position = (len(ordered) - 1) * p / 100
+    low = math.floor(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+def _histogram(ordered, bins):
+    """Equal-width histogram of a sorted list, like numpy.histogram"""
+    low, high = ordered[0], ordered[-1]
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    width = (high - low) / bins
+    edges = [low + width * i for i in range(bins)] + [high]
+    if not all(a < b for a, b in zip(edges, edges[1:])):
+        # No room for the bins (equal values too large to widen by ±0.5)
+        return [len(ordered)], [ordered[0], ordered[-1]]
+    counts = [0] * bins
+    for value in ordered:
+        counts[min(int((value - low) / width), bins - 1)] += 1
+    return counts, edges
+
+def _analyze_python(names, columns, top, bins, percentiles, offset):
+    by_unit = {}
+    pairs = Counter()
+    hours = Counter()
+    isfinite = math.isfinite
+    for ts, value, src, dst in zip(columns['ts'], columns['value'], columns['from'], columns['to']):
+        pairs[(src, dst)] += 1
+        hours[math.floor((ts + offset) / 3600)] += 1
+        if isfinite(value):
+            by_unit.setdefault(src, []).append(value)
+
+    units = []
+    for unit, values in by_unit.items():
+        values.sort()
+        try:
+            mean = math.fsum(values) / len(values)
+        except OverflowError:
+            mean = math.fsum(v / len(values) for v in values)
+        # Ranges wider than the largest float are handled at half scale, as with NumPy
+        halve = not isfinite(values[-1] - values[0])
+        scaled = [v / 2 for v in values] if halve else values
+        counts, edges = _histogram(scaled, bins)
+        quantiles = [_percentile(scaled, p) for p in percentiles]
+        if halve:
+            edges = [e * 2 for e in edges]
+            quantiles = [q * 2 for q in quantiles]
+        units.append(_unit_stats(names[unit], len(values), values[0], values[-1],
+                                 mean, quantiles, percentiles, edges, counts))
+    units.sort(key=lambda u: (-u['count'], u['unit']))
+    # Equal counts in (from, to) order, as _pair_counts ranks them
+    pairs = sorted(pairs.items(), key=lambda pair: (-pair[1], pair[0]))[:top]
+    return units, pairs, sorted(hours.items())
+
+def scaled_bar(count, largest, width):
+    """A bar of up to width blocks for count out of largest (at least one block if count > 0)"""
+    return "█" * max(1, round(count * width / largest)) if count else ""
+
+def format_report(report, max_units=10, histograms=3, hours=24, days=7, width=30):
+    """
+    Render an analyze() report as text lines
+
+    Args:
+        report (dict): Result of analyze()
+        max_units (int): Units listed with their value statistics (None for all)
+        histograms (int): Units whose histogram is drawn (None for all)
+        hours (int): Most recent hourly buckets shown (None for all)
+        days (int): Most recent daily buckets shown (None for all)
+        width (int): Length of the longest bar
+
+    Returns:
+        list: Lines of text
+    """
+    lines = []
+    total = report['total']
+
+    lines.append("Top Unit Pairs:")
+    for rank, pair in enumerate(report['top_pairs'], 1):
+        lines.append(f"  {rank:2d}. {pair['from']} → {pair['to']}: {pair['count']} "
+                     f"({pair['count'] / total:.1%})")
+
+    lines.append("")
+    lines.append("Input Values by Unit:")
+    units = report['units'] if max_units is None else report['units'][:max_units]
+    for i, unit in enumerate(units):
+        quantiles = "  ".join(f"{name}={value:.6g}" for name, value in unit['percentiles'].items())
+        lines.append(f"  {unit['unit']} (n={unit['count']}): min={unit['min']:.6g}  "
+                     f"mean={unit['mean']:.6g}  max={unit['max']:.6g}")
+        lines.append(f"      {quantiles}")
+        if histograms is None or i < histograms:
+            histogram = unit['histogram']
+            largest = max(histogram['counts'])
+            for low, high, count in zip(histogram['edges'], histogram['edges'][1:],
+                                        histogram['counts']):
+                lines.append(f"      [{low:>11.4g}, {high:>11.4g})  "
+                             f"{scaled_bar(count, largest, width)} {count}")
+
+    for title, key, peak, limit, fmt in (("Hourly", 'hourly', 'peak_hour', hours, '%Y-%m-%d %H:00'),
+                                         ("Daily", 'daily', 'peak_day', days, '%Y-%m-%d')):
+        buckets = report[key] if limit is None else report[key][-limit:]
+        largest = max(b['count'] for b in buckets)
+        peak = report[peak]
+        lines.append("")
+        lines.append(f"{title} Throughput (peak {peak['count']} at "
+                     f"{datetime.fromtimestamp(peak['start']).strftime(fmt)}):")
+        for bucket in buckets:
+            when = datetime.fromtimestamp(bucket['start']).strftime(fmt)
+            lines.append(f"  {when:16s} {scaled_bar(bucket['count'], largest, width)} {bucket['count']}")
+    return lines
@@ -0,0 +1,197 @@
+"""
+SQLite History Module
+Stores conversion history in an indexed SQLite database for long-term auditing
+Author: [Your Name]
+Date: November 24, 2025
+"""
+
+import atexit
+import sqlite3
+import time
+
+from history import ConversionHistory, ConversionRecord
+from history_analytics import rows_to_columns
+from metrics import timed
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversions (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    category TEXT NOT NULL,
+    value REAL NOT NULL,
+    from_unit TEXT NOT NULL,
+    to_unit TEXT NOT NULL,
+    result REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_conversions_ts ON conversions (ts);
+CREATE INDEX IF NOT EXISTS idx_conversions_category ON conversions (category, ts);
+CREATE INDEX IF NOT EXISTS idx_conversions_pair ON conversions (from_unit, to_unit, ts);
+"""
+
+COLUMNS = "ts, category, value, from_unit, to_unit, result"
+
+class SQLiteConversionHistory(ConversionHistory):
+    """
+    Conversion history kept in SQLite instead of an in-memory list
+
+    Offers the same interface as ConversionHistory (add_conversion,
+    display_history, get_statistics, export_to_text, clear_history, ...)
+    plus query() for category, unit pair and time range lookups.
+    """
+
+    def __init__(self, filename='conversion_history.db', max_entries=None, batch_size=64):
+        """
+        Open (or create) the history database
+
+        Args:
+            filename (str): SQLite database file
+            max_entries (int): Keep only this many recent rows (None keeps everything)
+            batch_size (int): Conversions buffered before they are inserted in one
+                              transaction (pending rows are written before any read)
+        """
+        self.filename = filename
+        self.max_entries = max_entries
+        self.batch_size = batch_size
+        self._pending = []
+        self._conn = sqlite3.connect(filename, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        atexit.register(self.close)
+
+    def add_conversion(self, category, value, from_unit, to_unit, result):
+        """Queue a conversion; rows are inserted in batches of batch_size"""
+        self._pending.append((time.time(), category.lower(), float(value), from_unit, to_unit,
+                              float(result)))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Insert all queued conversions in a single transaction"""
+        if not self._pending or self._conn is None:
+            return
+        rows, self._pending = self._pending, []
+        try:
+            with self._conn:
+                self._conn.executemany(f"INSERT INTO conversions ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)",
+                                       rows)
+                if self.max_entries is not None:
+                    self._conn.execute(
+                        "DELETE FROM conversions WHERE id <= "
+                        "(SELECT id FROM conversions ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                        (self.max_entries,))
+        except sqlite3.Error as e:
+            print(f"⚠️  Warning: Could not save history: {e}")
+
+    def query(self, category=None, from_unit=None, to_unit=None, since=None, until=None,
+              limit=None):
+        """
+        Find conversions by category, unit pair and time range
+
+        Args:
+            category (str): Only this category
+            from_unit (str): Only conversions from this unit
+            to_unit (str): Only conversions to this unit
+            since (float): Earliest epoch timestamp (inclusive)
+            until (float): Latest epoch timestamp (exclusive)
+            limit (int): Return only the most recent limit matches
+
+        Returns:
+            list: ConversionRecord objects, oldest first
+        """
+        clauses = []
+        params = []
+        for column, value in (('category', category and category.lower()),
+                              ('from_unit', from_unit), ('to_unit', to_unit)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("ts < ?")
+            params.append(until)
+
+        sql = f"SELECT {COLUMNS} FROM conversions"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        self.flush()
+        rows = self._conn.execute(sql, params).fetchall()
+        return [ConversionRecord(*row) for row in reversed(rows)]
+
+    def recent(self, limit):
+        """The last limit records, oldest first"""
+        return self.query(limit=limit)
+
+    def entries(self):
+        """Iterate over all records, oldest first, without loading them all"""
+        self.flush()
+        cursor = self._conn.execute(f"SELECT {COLUMNS} FROM conversions ORDER BY id")
+        for row in cursor:
+            yield ConversionRecord(*row)
+
+    def __len__(self):
+        self.flush()
+        return self._conn.execute("SELECT COUNT(*) FROM conversions").fetchone()[0]
+
+    def columns(self):
+        """History as (names, columns), read straight from the rows without building records"""
+        self.flush()
+        return rows_to_columns(self._conn.execute(f"SELECT {COLUMNS} FROM conversions ORDER BY id"))
+
+    def get_statistics(self):
+        """Get statistics about conversion usage, computed with SQL aggregates"""
+        total = len(self)
+        if not total:
+            return None
+
+        by_category = {category.capitalize(): count for category, count in self._conn.execute(
+            "SELECT category, COUNT(*) FROM conversions GROUP BY category")}
+        by_unit_pair = {f"{src} → {dst}": count for src, dst, count in self._conn.execute(
+            "SELECT from_unit, to_unit, COUNT(*) FROM conversions GROUP BY from_unit, to_unit")}
+
+        now = time.time()
+        last_hour, last_day = self._conn.execute(
+            "SELECT COUNT(CASE WHEN ts >= ? THEN 1 END), COUNT(*) FROM conversions WHERE ts >= ?",
+            (now - 3600, now - 86400)).fetchone()
+
+        return {
+            'total_conversions': total,
+            'by_category': by_category,
+            'most_used': max(by_category.items(), key=lambda x: x[1])[0],
+            'by_unit_pair': by_unit_pair,
+            'most_used_pair': max(by_unit_pair.items(), key=lambda x: x[1])[0],
+            'last_hour': last_hour,
+            'last_day': last_day
+        }
+
+    def clear_history(self):
+        """Clear all conversion history"""
+        self._pending = []
+        with self._conn:
+            self._conn.execute("DELETE FROM conversions")
+        print("\n✅ Conversion history cleared successfully!\n")
+
+    @timed('save_to_file')
+    def save_to_file(self):
+        """Write any queued conversions to the database"""
+        self.flush()
+
+    @timed('load_from_file')
+    def load_from_file(self):
+        """Nothing to load: the database is queried on demand"""
+
+    def close(self):
+        """Flush queued conversions and close the database"""
+        if self._conn is None:
+            return
+        self.flush()
+        self._conn.close()
+        self._conn = None
+        atexit.unregister(self.close)
@@ -0,0 +1,217 @@
+"""
+History Export Module
+Streams conversion history to CSV, JSONL or a compact columnar binary file
+Author: [Your Name]
+Date: November 24, 2025
+
+Binary format (little-endian):
+    header   b'UCHB', version (uint16), reserved (uint16)
+    blocks   rows (uint32), reserved (uint32), then the columns of up to
+             chunk_rows records: ts, value, result (float64 each) and
+             category, from, to (uint16 indexes into the dictionary),
+             zero-padded to a multiple of 8 bytes
+    footer   the dictionary: names encoded as UTF-8 and joined with '\\0'
+    trailer  footer offset (uint64), footer length (uint32), block count
+             (uint32), b'UCHB'
+"""
+
+from array import array
+from itertools import islice
+import csv
+import json
+import os
+import struct
+import sys
+
+EXPORT_FORMATS = ('csv', 'jsonl', 'bin')
+
+# Records written per chunk (and per binary block)
+CHUNK_ROWS = 8192
+
+# Output buffer size for exports
+IO_BUFFER = 1 << 20
+
+MAGIC = b'UCHB'
+VERSION = 1
+HEADER = struct.Struct('<4sHH')
+BLOCK_HEADER = struct.Struct('<II')
+TRAILER = struct.Struct('<QII4s')
+
+# Binary columns in file order: float64 columns, then uint16 dictionary indexes
+FLOAT_COLUMNS = ('ts', 'value', 'result')
+INDEX_COLUMNS = ('category', 'from', 'to')
+
+FIELDS = ['ts', 'category', 'value', 'from', 'to', 'result']
+
+def detect_export_format(filename):
+    """Pick the export format from a file extension (default: csv)"""
+    ext = os.path.splitext(filename)[1].lower()
+    if ext in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    if ext in ('.bin', '.uchb'):
+        return 'bin'
+    return 'csv'
+
+def _chunks(records, chunk_rows):
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, chunk_rows))
+        if not chunk:
+            return
+        yield chunk
+
+def _write_csv(records, f, chunk_rows):
+    writer = csv.writer(f)
+    writer.writerow(FIELDS)
+    rows = 0
+    for chunk in _chunks(records, chunk_rows):
+        writer.writerows((r.timestamp, r.category, r.value, r.from_unit, r.to_unit, r.result)
+                         for r in chunk)
+        rows += len(chunk)
+    return rows
+
+def _write_jsonl(records, f, chunk_rows):
+    rows = 0
+    for chunk in _chunks(records, chunk_rows):
+        f.write(''.join(json.dumps(r.to_dict()) + '\n' for r in chunk))
+        rows += len(chunk)
+    return rows
+
+def _write_binary(records, f, chunk_rows):
+    names = []
+    index = {}
+
+    def lookup(name):
+        try:
+            return index[name]
+        except KeyError:
+            if len(names) > 0xFFFF:
+                raise ValueError("Too many distinct units for the binary format") from None
+            index[name] = len(names)
+            names.append(name)
+            return index[name]
+
+    f.write(HEADER.pack(MAGIC, VERSION, 0))
+    rows = 0
+    blocks = 0
+    for chunk in _chunks(records, chunk_rows):
+        columns = [
+            array('d', [r.timestamp for r in chunk]),
+            array('d', [r.value for r in chunk]),
+            array('d', [r.result for r in chunk]),
+            array('H', [lookup(r.category) for r in chunk]),
+            array('H', [lookup(r.from_unit) for r in chunk]),
+            array('H', [lookup(r.to_unit) for r in chunk])
+        ]
+        f.write(BLOCK_HEADER.pack(len(chunk), 0))
+        for column in columns:
+            if sys.byteorder != 'little':
+                column.byteswap()
+            f.write(column.tobytes())
+        f.write(bytes(-len(chunk) * 6 % 8))
+        rows += len(chunk)
+        blocks += 1
+
+    footer = '\0'.join(names).encode('utf-8')
+    footer_offset = f.tell()
+    f.write(footer)
+    f.write(TRAILER.pack(footer_offset, len(footer), blocks, MAGIC))
+    return rows
+
+def export_history(records, filename, fmt=None, chunk_rows=CHUNK_ROWS):
+    """
+    Stream history records to a file
+
+    Records are consumed chunk_rows at a time, so memory use does not grow
+    with the size of the history. The file is written to a temporary name
+    and renamed into place when complete.
+
+    Args:
+        records (iterable): ConversionRecord objects, oldest first
+        filename (str): Output file
+        fmt (str): 'csv', 'jsonl' or 'bin' (default: from the extension)
+        chunk_rows (int): Records per chunk
+
+    Returns:
+        int: Number of records written
+
+    Raises:
+        ValueError: If the format is unknown
+        OSError: If the file cannot be written
+    """
+    fmt = fmt or detect_export_format(filename)
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    temp_filename = filename + '.tmp'
+    try:
+        if fmt == 'bin':
+            with open(temp_filename, 'wb', buffering=IO_BUFFER) as f:
+                rows = _write_binary(records, f, chunk_rows)
+        else:
+            with open(temp_filename, 'w', encoding='utf-8', newline='', buffering=IO_BUFFER) as f:
+                write = _write_csv if fmt == 'csv' else _write_jsonl
+                rows = write(records, f, chunk_rows)
+        os.replace(temp_filename, filename)
+    except BaseException:
+        if os.path.exists(temp_filename):
+            os.remove(temp_filename)
+        raise
+    return rows
+
+def read_binary(filename):
+    """
+    Load a binary export
+
+    Columns are copied straight from the file into typed arrays; nothing is
+    parsed. With NumPy, np.asarray(column) wraps a column without copying.
+
+    Returns:
+        tuple: (names, columns) - the unit/category dictionary as a list and
+               a dict of column name -> array.array (ts, value, result as
+               float64; category, from, to as indexes into names)
+
+    Raises:
+        ValueError: If the file is not a binary history export
+    """
+    columns = {name: array('d') for name in FLOAT_COLUMNS}
+    columns.update({name: array('H') for name in INDEX_COLUMNS})
+
+    with open(filename, 'rb') as f:
+        magic, version, _ = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a binary history export: {filename}")
+        f.seek(-TRAILER.size, os.SEEK_END)
+        footer_offset, footer_length, blocks, magic = TRAILER.unpack(f.read(TRAILER.size))
+        if magic != MAGIC:
+            raise ValueError(f"Truncated binary history export: {filename}")
+
+        f.seek(HEADER.size)
+        for _ in range(blocks):
+            rows, _ = BLOCK_HEADER.unpack(f.read(BLOCK_HEADER.size))
+            for name in FLOAT_COLUMNS + INDEX_COLUMNS:
+                column = columns[name]
+                size = rows * column.itemsize
+                start = len(column)
+                column.frombytes(f.read(size))
+                if sys.byteorder != 'little':
+                    chunk = column[start:]
+                    chunk.byteswap()
+                    column[start:] = chunk
+            f.seek(-rows * 6 % 8, os.SEEK_CUR)
+
+        f.seek(footer_offset)
+        footer = f.read(footer_length).decode('utf-8')
+    names = footer.split('\0') if footer else []
+    return names, columns
+
+def binary_records(filename):
+    """
+    Iterate over a binary export as (ts, category, value, from, to, result) tuples
+
+    The tuples match ConversionRecord's constructor arguments.
+    """
+    names, columns = read_binary(filename)
+    return zip(columns['ts'], (names[i] for i in columns['category']), columns['value'],
+               (names[i] for i in columns['from']), (names[i] for i in columns['to']),
+               columns['result'])
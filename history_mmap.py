@@ -0,0 +1,312 @@
+"""
+Memory-Mapped History Module
+Stores conversion history as fixed-size binary records read through mmap
+Author: [Your Name]
+Date: November 24, 2025
+
+File layout (little-endian):
+    header      64 bytes: b'UCHM', version (uint16), record size (uint16),
+                name bytes (uint32), names used (uint32), records (uint64)
+    records     32 bytes each: timestamp, value, result (float64) and
+                category, from, to (uint16 indexes into the dictionary)
+
+Unit and category names live out of line in <filename>.names, each stored as
+a uint16 byte length followed by the UTF-8 name, so the dictionary grows with
+the history (up to 65536 names) without moving any records. The header says
+how many names and name bytes are committed; anything past that is left over
+from a failed write and gets overwritten.
+
+Opening a file maps it without reading it, and recent()/records() decode
+only the records they return, so the cost of display_history does not
+depend on how long the history is.
+"""
+
+from array import array
+import atexit
+import mmap
+import os
+import struct
+import time
+
+import converter
+from history import ConversionHistory, ConversionRecord
+from history_analytics import summarize
+from locking import FileLock
+from metrics import timed
+
+MAGIC = b'UCHM'
+VERSION = 2
+HEADER = struct.Struct('<4sHHIIQ')
+HEADER_SIZE = 64
+NAME_LENGTH = struct.Struct('<H')
+# Names addressable by the uint16 indexes in a record
+NAME_LIMIT = 1 << 16
+RECORD = struct.Struct('<dddHHH2x')
+
+# NumPy view of one record (see columns())
+RECORD_FIELDS = [('ts', '<f8'), ('value', '<f8'), ('result', '<f8'),
+                 ('category', '<u2'), ('from', '<u2'), ('to', '<u2'), ('pad', 'V2')]
+
+# Records decoded per step when iterating over the whole file
+SCAN_ROWS = 65536
+
+class MappedConversionHistory(ConversionHistory):
+    """
+    Conversion history in a memory-mapped file of fixed-size records
+
+    Offers the same interface as ConversionHistory, plus records(start, stop)
+    for random access to any slice. History is never trimmed.
+    """
+
+    def __init__(self, filename='conversion_history.bin', flush_every=1):
+        """
+        Open (or create) the history file
+
+        Args:
+            filename (str): Binary history file
+            flush_every (int): Conversions buffered before they are appended
+                               (pending ones are written before any read)
+        """
+        self.filename = filename
+        self.flush_every = flush_every
+        self._unsaved = []
+        self._lock = FileLock(filename)
+        self._names = []
+        self._name_ids = {}
+        self._names_end = 0
+        self._map = None
+
+        with self._lock:
+            if not os.path.exists(filename) or os.path.getsize(filename) == 0:
+                with open(filename, 'wb') as f:
+                    f.write(HEADER.pack(MAGIC, VERSION, RECORD.size, 0, 0, 0)
+                            .ljust(HEADER_SIZE, b'\0'))
+            if not os.path.exists(filename + '.names'):
+                open(filename + '.names', 'wb').close()
+        self._file = open(filename, 'r+b')
+        magic, version, record_size, _, _, _ = HEADER.unpack(self._file.read(HEADER.size))
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            self._file.close()
+            raise ValueError(f"Not a binary history file: {filename}")
+        self._names_file = open(filename + '.names', 'r+b')
+        self._data_start = HEADER_SIZE
+        self._remap()
+        atexit.register(self.close)
+
+    def _remap(self):
+        """Map the whole file (again, after it has grown)"""
+        if self._map is not None:
+            self._map.close()
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _header(self):
+        """(names used, name bytes, records) as last committed by any process"""
+        _, _, _, name_bytes, names, count = HEADER.unpack_from(self._map, 0)
+        return names, name_bytes, count
+
+    def _load_names(self, used, name_bytes):
+        """Pick up dictionary names committed since the last call"""
+        if used <= len(self._names):
+            return
+        self._names_file.seek(self._names_end)
+        data = self._names_file.read(name_bytes - self._names_end)
+        pos = 0
+        while len(self._names) < used:
+            (size,) = NAME_LENGTH.unpack_from(data, pos)
+            name = data[pos + NAME_LENGTH.size:pos + NAME_LENGTH.size + size].decode('utf-8')
+            pos += NAME_LENGTH.size + size
+            self._name_ids[name] = len(self._names)
+            self._names.append(name)
+        self._names_end += pos
+
+    def _name_slot(self, name, pending):
+        """Dictionary index for name, reserving a new one (listed in pending) if needed"""
+        try:
+            return self._name_ids[name]
+        except KeyError:
+            pass
+        encoded = name.encode('utf-8')
+        if len(encoded) >= 1 << (8 * NAME_LENGTH.size):
+            raise ValueError(f"Unit name too long for the binary history: {name[:40]}...")
+        slot = len(self._names)
+        if slot >= NAME_LIMIT:
+            raise ValueError("Binary history dictionary is full")
+        self._names.append(name)
+        self._name_ids[name] = slot
+        pending.append(NAME_LENGTH.pack(len(encoded)) + encoded)
+        return slot
+
+    def _forget_names(self, committed):
+        """Drop names reserved after the first committed ones (their write failed)"""
+        for name in self._names[committed:]:
+            del self._name_ids[name]
+        del self._names[committed:]
+
+    def add_conversion(self, category, value, from_unit, to_unit, result):
+        """Queue a conversion; records are appended every flush_every conversions"""
+        self._unsaved.append((time.time(), category.lower(), float(value), from_unit, to_unit,
+                              float(result)))
+        if len(self._unsaved) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        """Append queued conversions and commit them by updating the header count"""
+        if not self._unsaved or self._file is None:
+            return
+        rows, self._unsaved = self._unsaved, []
+        committed = len(self._names)
+        try:
+            with self._lock:
+                used, name_bytes, count = self._header()
+                self._load_names(used, name_bytes)
+                committed = len(self._names)
+                new_names = []
+                packed = []
+                for ts, category, value, from_unit, to_unit, result in rows:
+                    try:
+                        ids = (self._name_slot(category, new_names),
+                               self._name_slot(from_unit, new_names),
+                               self._name_slot(to_unit, new_names))
+                    except ValueError as e:
+                        # Only this record is lost; the rest of the batch is still written
+                        print(f"⚠️  Warning: Could not save history record: {e}")
+                        continue
+                    packed.append(RECORD.pack(ts, value, result, *ids))
+
+                names = b''.join(new_names)
+                self._names_file.seek(name_bytes)
+                self._names_file.write(names)
+                self._names_file.flush()
+                f = self._file
+                f.seek(self._data_start + count * RECORD.size)
+                f.write(b''.join(packed))
+                f.flush()
+                # Names and records first, then the header: readers never see uncommitted rows
+                f.seek(0)
+                f.write(HEADER.pack(MAGIC, VERSION, RECORD.size, name_bytes + len(names),
+                                    len(self._names), count + len(packed)))
+                f.flush()
+                self._names_end = name_bytes + len(names)
+        except OSError as e:
+            # Keep the batch for the next flush and forget the names reserved for it
+            self._forget_names(committed)
+            self._unsaved[:0] = rows
+            print(f"⚠️  Warning: Could not save history: {e}")
+
+    def records(self, start=0, stop=None):
+        """
+        Decode a slice of the history, touching only those records
+
+        Args:
+            start (int): First record (negative counts from the end)
+            stop (int): End of the slice (None for the end of the history)
+
+        Returns:
+            list: ConversionRecord objects, oldest first
+        """
+        self.flush()
+        used, name_bytes, count = self._header()
+        start, stop, _ = slice(start, stop).indices(count)
+        if stop <= start:
+            return []
+        end = self._data_start + stop * RECORD.size
+        if end > len(self._map):
+            self._remap()
+        self._load_names(used, name_bytes)
+        names = self._names
+        view = memoryview(self._map)[self._data_start + start * RECORD.size:end]
+        try:
+            return [ConversionRecord(ts, names[category], value, names[src], names[dst], result)
+                    for ts, value, result, category, src, dst in RECORD.iter_unpack(view)]
+        finally:
+            view.release()
+
+    def recent(self, limit):
+        """The last limit records, oldest first"""
+        return self.records(-limit) if limit > 0 else []
+
+    def entries(self):
+        """Iterate over all records, oldest first, SCAN_ROWS at a time"""
+        count = len(self)
+        for start in range(0, count, SCAN_ROWS):
+            yield from self.records(start, min(start + SCAN_ROWS, count))
+
+    def __len__(self):
+        self.flush()
+        return self._header()[2]
+
+    def columns(self):
+        """
+        History as (names, columns) for columnar analytics
+
+        With NumPy each column is copied out of the mapping in one strided
+        pass; without it the records are unpacked SCAN_ROWS at a time.
+        """
+        total = len(self)
+        self._load_names(*self._header()[:2])
+        if self._data_start + total * RECORD.size > len(self._map):
+            self._remap()
+
+        np = converter._numpy()
+        if np is not None:
+            view = np.frombuffer(self._map, dtype=np.dtype(RECORD_FIELDS), count=total,
+                                 offset=self._data_start)
+            columns = {name: view[name].copy() for name, _ in RECORD_FIELDS[:-1]}
+            del view  # release the mapping so it can be remapped or closed
+            return list(self._names), columns
+
+        columns = {'ts': array('d'), 'value': array('d'), 'result': array('d'),
+                   'category': array('H'), 'from': array('H'), 'to': array('H')}
+        appends = [columns[name].append for name, _ in RECORD_FIELDS[:-1]]
+        for start in range(0, total, SCAN_ROWS):
+            stop = min(start + SCAN_ROWS, total)
+            view = memoryview(self._map)[self._data_start + start * RECORD.size:
+                                         self._data_start + stop * RECORD.size]
+            try:
+                for row in RECORD.iter_unpack(view):
+                    for append, item in zip(appends, row):
+                        append(item)
+            finally:
+                view.release()
+        return list(self._names), columns
+
+    def get_statistics(self):
+        """Get statistics about conversion usage from the record columns (vectorized with NumPy)"""
+        return summarize(*self.columns())
+
+    def clear_history(self):
+        """
+        Clear all conversion history (the unit dictionary is kept)
+
+        Only the record count is reset. The file is never shrunk, because
+        other processes may still have the old records mapped.
+        """
+        self._unsaved = []
+        with self._lock:
+            used, name_bytes, _ = self._header()
+            self._file.seek(0)
+            self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, name_bytes, used, 0))
+            self._file.flush()
+        print("\n✅ Conversion history cleared successfully!\n")
+
+    @timed('save_to_file')
+    def save_to_file(self):
+        """Append any queued conversions to the file"""
+        self.flush()
+
+    @timed('load_from_file')
+    def load_from_file(self):
+        """Nothing to load: records are read from the mapping on demand"""
+
+    def close(self):
+        """Flush queued conversions and unmap the file"""
+        if self._file is None:
+            return
+        self.flush()
+        self._map.close()
+        self._file.close()
+        self._names_file.close()
+        self._map = None
+        self._file = None
+        self._lock.close()
+        atexit.unregister(self.close)
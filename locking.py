@@ -0,0 +1,125 @@
+"""
+File Locking Module
+Advisory locks and atomic file replacement for files shared between processes
+Author: [Your Name]
+Date: November 24, 2025
+"""
+
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:  # POSIX
+    msvcrt = None
+
+class FileLock:
+    """
+    Exclusive advisory lock on <path>.lock, shared by every process using path
+
+    Use it as a context manager around each read-modify-write of the file.
+    The lock is reentrant within a process (and serializes its threads), so
+    methods holding it can call each other.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): The file being protected; the lock lives next to it
+        """
+        self.path = path + '.lock'
+        self._fd = None
+        self._depth = 0
+        self._thread_lock = threading.RLock()
+
+    def acquire(self):
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                if self._fd is None:
+                    self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                _lock_fd(self._fd)
+            except BaseException:
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0:
+            _unlock_fd(self._fd)
+        self._thread_lock.release()
+
+    def close(self):
+        """Close the lock file handle (it is reopened on the next acquire)"""
+        with self._thread_lock:
+            if self._fd is not None and self._depth == 0:
+                os.close(self._fd)
+                self._fd = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+def _lock_fd(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+    elif msvcrt is not None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        while True:
+            try:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue  # LK_LOCK gives up after ~10 seconds; keep waiting
+
+def _unlock_fd(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    elif msvcrt is not None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+def atomic_write(filename, text, durable=True):
+    """
+    Replace a file's contents so readers see either the old or the new file
+
+    The text is written to a temporary file unique to this process, synced
+    to disk (unless durable=False) and renamed over filename.
+
+    Args:
+        filename (str): File to replace
+        text (str | bytes): New contents (str is written as UTF-8)
+        durable (bool): fsync before the rename so a crash cannot leave an empty file
+    """
+    temp_filename = f"{filename}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        if isinstance(text, bytes):
+            f = open(temp_filename, 'wb')
+        else:
+            f = open(temp_filename, 'w', encoding='utf-8')
+        with f:
+            f.write(text)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_filename, filename)
+    except BaseException:
+        if os.path.exists(temp_filename):
+            os.remove(temp_filename)
+        raise
+
+def file_replaced(f, filename):
+    """True when filename no longer refers to the open file f (rotated, compacted or deleted)"""
+    try:
+        return os.stat(filename).st_ino != os.fstat(f.fileno()).st_ino
+    except FileNotFoundError:
+        return True
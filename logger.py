@@ -6,7 +6,21 @@ Date: November 24, 2025
 """
 
 from datetime import datetime
+import atexit
+import glob
+import gzip
+import json
 import os
+import queue
+import threading
+import time
+
+from locking import FileLock, atomic_write, file_replaced
+from metrics import timed
+
+# Fixed positions of the fields in "[YYYY-MM-DD HH:MM:SS.mmm] [LEVEL   ] message"
+TIMESTAMP_SLICE = slice(1, 24)
+LEVEL_SLICE = slice(27, 35)
 
 class ApplicationLogger:
     """Handles application logging with multiple severity levels"""
@@ -18,21 +32,64 @@ class ApplicationLogger:
     ERROR = 'ERROR'
     CRITICAL = 'CRITICAL'
     
-    def __init__(self, filename='application.log', console_output=False):
+    # Policies when the background writer's queue is full
+    BLOCK = 'block'
+    DROP = 'drop'
+    
+    LEVELS = (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+    
+    def __init__(self, filename='application.log', console_output=False, async_write=False,
+                 queue_size=10000, batch_size=256, flush_interval=0.5, on_full=BLOCK,
+                 max_bytes=None, max_archives=10):
         """
         Initialize logger
         
         Args:
             filename (str): Log file name
             console_output (bool): Whether to also print to console
+            async_write (bool): Hand lines to a background writer thread that
+                                keeps the log file open and flushes in batches
+            queue_size (int): Maximum lines waiting for the background writer
+            batch_size (int): Lines written before the file is flushed
+            flush_interval (float): Seconds before pending lines are flushed anyway
+            on_full (str): BLOCK to wait for queue space, DROP to discard the line
+            max_bytes (int): Rotate the log into a gzip archive once it reaches
+                             this size (None disables rotation)
+            max_archives (int): Number of rotated archives to keep
+        
+        Nothing is written (and no writer thread is started) until the first
+        message is logged; the session header is written just before it.
         """
+        if on_full not in (self.BLOCK, self.DROP):
+            raise ValueError(f"on_full must be '{self.BLOCK}' or '{self.DROP}'")
+        
         self.filename = filename
         self.console_output = console_output
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.on_full = on_full
+        self.dropped = 0
+        self.max_bytes = max_bytes
+        self.max_archives = max_archives
+        self.async_write = async_write
+        self.queue_size = queue_size
+        self._file = None
+        self._lock = FileLock(filename)
+        self._queue = None
+        self._writer = None
+        self._session_logged = False
         self.session_start = datetime.now()
+    
+    def _start_session(self):
+        """Open the log on first use: start the writer and write the session header"""
+        self._session_logged = True
+        if self.async_write:
+            self._start_writer(self.queue_size)
         self._log(self.INFO, "="*60)
         self._log(self.INFO, f"Application started - Session: {self.session_start.strftime('%Y-%m-%d %H:%M:%S')}")
         self._log(self.INFO, "="*60)
     
+    @timed('_log')
     def _log(self, level, message):
         """
         Internal logging method
@@ -41,13 +98,16 @@ class ApplicationLogger:
             level (str): Log level
             message (str): Log message
         """
+        if not self._session_logged:
+            self._start_session()
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
         log_entry = f"[{timestamp}] [{level:8s}] {message}"
         
         try:
-            # Write to file
-            with open(self.filename, 'a', encoding='utf-8') as f:
-                f.write(log_entry + '\n')
+            if self._writer is not None:
+                self._enqueue(log_entry)
+            else:
+                self._append(log_entry + '\n')
             
             # Optionally print to console
             if self.console_output:
@@ -56,6 +116,242 @@ class ApplicationLogger:
         except Exception as e:
             print(f"⚠️  Logging error: {e}")
     
+    def _start_writer(self, queue_size):
+        """Start the background writer thread and make sure it is flushed at exit"""
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._writer = threading.Thread(target=self._writer_loop, name='log-writer', daemon=True)
+        self._writer.start()
+        atexit.register(self._stop_writer)
+    
+    def _enqueue(self, log_entry):
+        """Queue one line for the writer, blocking or dropping when the queue is full"""
+        if self.on_full == self.BLOCK:
+            self._queue.put(log_entry)
+            return
+        try:
+            self._queue.put_nowait(log_entry)
+        except queue.Full:
+            self.dropped += 1
+    
+    def _writer_loop(self):
+        """
+        Background writer: lines are collected and appended in batches
+        
+        Besides log lines the queue carries threading.Event objects, which
+        request a flush (the event is set once it's done), and None, which
+        stops the writer after everything before it has been written.
+        """
+        buffered = []
+        last_flush = time.monotonic()
+        running = True
+        while running:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                batch = []
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            buffered.extend(item for item in batch if isinstance(item, str))
+            events = [item for item in batch if isinstance(item, threading.Event)]
+            running = None not in batch
+            
+            now = time.monotonic()
+            if buffered and (len(buffered) >= self.batch_size or events or not running
+                             or now - last_flush >= self.flush_interval):
+                try:
+                    self._append('\n'.join(buffered) + '\n')
+                except Exception as e:
+                    print(f"⚠️  Logging error: {e}")
+                buffered = []
+                last_flush = now
+            
+            for event in events:
+                event.set()
+    
+    def _append(self, text):
+        """
+        Append text to the log file, rotating the log when it is due
+        
+        Several processes may share the log: each append is a single write
+        made under an advisory file lock, so lines from different processes
+        never interleave, and the file is reopened whenever another process
+        has rotated it.
+        """
+        data = text.encode('utf-8')
+        with self._lock:
+            if self._file is None or file_replaced(self._file, self.filename):
+                self._close_file()
+                self._file = open(self.filename, 'ab', buffering=0)
+            self._file.write(data)
+            if self.max_bytes is not None and os.fstat(self._file.fileno()).st_size >= self.max_bytes:
+                self._close_file()
+                self._rotate()
+    
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    
+    def _rotate(self):
+        """
+        Move the current log into a gzip archive with a sidecar index
+        
+        The index (<archive>.idx.json) holds the segment's per-level counts
+        and time range, so summaries never have to decompress the archive.
+        Called with the log's file lock held.
+        """
+        if not os.path.exists(self.filename):
+            return
+        
+        base = f"{self.filename}.{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}"
+        try:
+            os.replace(self.filename, base)
+            if os.path.exists(self.filename + '.summary.json'):
+                os.remove(self.filename + '.summary.json')
+            index = self._scan_segment(base)
+            with open(base, 'rb') as src, gzip.open(base + '.gz', 'wb') as dst:
+                while True:
+                    block = src.read(1 << 20)
+                    if not block:
+                        break
+                    dst.write(block)
+            with open(base + '.idx.json', 'w', encoding='utf-8') as f:
+                json.dump(index, f)
+            os.remove(base)
+            self._prune_archives()
+        except Exception as e:
+            print(f"⚠️  Logging error: Could not rotate log: {e}")
+    
+    def _prune_archives(self):
+        """Delete the oldest archives beyond max_archives"""
+        archives = sorted(glob.glob(glob.escape(self.filename) + '.*.gz'))
+        for archive in archives[:max(0, len(archives) - self.max_archives)]:
+            os.remove(archive)
+            index = archive[:-len('.gz')] + '.idx.json'
+            if os.path.exists(index):
+                os.remove(index)
+    
+    def _scan_segment(self, path):
+        """Count entries per level and find the time range of one log file"""
+        counts = dict.fromkeys(self.LEVELS, 0)
+        entries = 0
+        first = last = None
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                entries += 1
+                level = line[LEVEL_SLICE].rstrip()
+                if level in counts:
+                    counts[level] += 1
+                    if first is None:
+                        first = line[TIMESTAMP_SLICE]
+                    last = line[TIMESTAMP_SLICE]
+        return {'entries': entries, 'levels': counts, 'first': first, 'last': last}
+    
+    def _archive_indexes(self):
+        """Load the sidecar indexes of all rotated archives, oldest first"""
+        indexes = []
+        for path in sorted(glob.glob(glob.escape(self.filename) + '.*.idx.json')):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    indexes.append(json.load(f))
+            except Exception:
+                continue
+        return indexes
+    
+    def _update_summary_state(self):
+        """
+        Bring the persisted summary of the current log file up to date
+        
+        Running level counts and the byte offset already counted are kept in
+        <filename>.summary.json, so each call reads only the bytes appended
+        since the previous one. The counts start over when the file has been
+        rotated or truncated (different inode, or shorter than the offset).
+        
+        Returns:
+            dict: offset, inode, entries and per-level counts
+        """
+        state_file = self.filename + '.summary.json'
+        empty = {'offset': 0, 'inode': None, 'entries': 0, 'levels': dict.fromkeys(self.LEVELS, 0)}
+        
+        if not os.path.exists(self.filename):
+            return empty
+        stat = os.stat(self.filename)
+        
+        state = None
+        try:
+            with open(state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            pass
+        if not state or state.get('inode') != stat.st_ino or state.get('offset', 0) > stat.st_size:
+            state = empty
+        state['inode'] = stat.st_ino
+        if state['offset'] == stat.st_size:
+            return state
+        
+        levels = {level.ljust(8).encode('ascii'): level for level in self.LEVELS}
+        counts = dict.fromkeys(levels, 0)
+        entries = 0
+        offset = state['offset']
+        with open(self.filename, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # partial line still being written
+                offset += len(line)
+                entries += 1
+                key = line[LEVEL_SLICE]
+                if key in counts:
+                    counts[key] += 1
+        
+        state['offset'] = offset
+        state['entries'] += entries
+        for key, count in counts.items():
+            state['levels'][levels[key]] = state['levels'].get(levels[key], 0) + count
+        
+        try:
+            atomic_write(state_file, json.dumps(state), durable=False)
+        except OSError:
+            pass
+        return state
+    
+    def flush(self):
+        """Block until every queued line has been written to the log file"""
+        if self._writer is None or not self._writer.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+    
+    def _stop_writer(self):
+        """Flush and stop the background writer; later lines are written directly"""
+        writer = self._writer
+        if writer is None:
+            return
+        self._writer = None
+        if writer.is_alive():
+            self._queue.put(None)
+            writer.join()
+        atexit.unregister(self._stop_writer)
+        
+        # Lines queued by other threads while the writer was stopping
+        leftover = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, str):
+                leftover.append(item)
+            elif isinstance(item, threading.Event):
+                item.set()
+        if leftover:
+            self._append('\n'.join(leftover) + '\n')
+    
     def debug(self, message):
         """Log debug message"""
         self._log(self.DEBUG, message)
@@ -88,6 +384,12 @@ class ApplicationLogger:
         """Log user action"""
         self.info(f"User action: {action}")
     
+    def log_cache_stats(self, stats):
+        """Log conversion cache counters (from ConversionCache.stats)"""
+        self.info(f"Conversion cache - size: {stats['size']}/{stats['maxsize']}, hits: {stats['hits']}, "
+                  f"misses: {stats['misses']}, evictions: {stats['evictions']}, "
+                  f"hit rate: {stats['hit_rate']:.1%}")
+    
     def close_session(self):
         """Log session end"""
         session_end = datetime.now()
@@ -95,36 +397,34 @@ class ApplicationLogger:
         self._log(self.INFO, "="*60)
         self._log(self.INFO, f"Application closed - Duration: {duration}")
         self._log(self.INFO, "="*60)
+        self._stop_writer()
+        with self._lock:
+            self._close_file()
+        self._lock.close()
     
     def get_log_summary(self):
-        """Get summary of log file"""
-        if not os.path.exists(self.filename):
+        """Get summary of log file, including rotated archives (via their indexes)"""
+        self.flush()
+        indexes = self._archive_indexes()
+        if not indexes and not os.path.exists(self.filename):
             return "No log file found."
         
         try:
-            with open(self.filename, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-            
-            # Count by level
-            level_counts = {
-                self.DEBUG: 0,
-                self.INFO: 0,
-                self.WARNING: 0,
-                self.ERROR: 0,
-                self.CRITICAL: 0
-            }
-            
-            for line in lines:
-                for level in level_counts:
-                    if f'[{level}]' in line:
-                        level_counts[level] += 1
-                        break
+            state = self._update_summary_state()
+            level_counts = dict(state['levels'])
+            total = state['entries']
+            for index in indexes:
+                total += index['entries']
+                for level, count in index['levels'].items():
+                    level_counts[level] = level_counts.get(level, 0) + count
             
             summary = f"\n📄 Log File: {self.filename}\n"
-            summary += f"   Total Entries: {len(lines)}\n"
+            summary += f"   Total Entries: {total}\n"
             for level, count in level_counts.items():
                 if count > 0:
                     summary += f"   {level}: {count}\n"
+            if indexes:
+                summary += f"   Archives: {len(indexes)} (since {indexes[0]['first']})\n"
             
             return summary
         
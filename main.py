@@ -1,51 +1,65 @@
+import argparse
 import sys
-from converter import convert_length, convert_temperature, convert_weight, convert_time, get_available_units
+import metrics
+from batch import CHUNK_BYTES, run_batch
+from converter import CATEGORY_LABELS, ConversionCache, convert, get_available_units, get_categories
 from history import ConversionHistory
-from validator import get_valid_number, get_valid_choice, get_menu_choice, confirm_action, display_error, display_success
+from validator import get_valid_number, get_valid_unit, get_menu_choice, confirm_action, display_error, display_success
 from logger import ApplicationLogger
+from pipe import run_pipe
 
 def show_banner():
     print("\n======================================================================")
     print("UNIT CONVERTER PRO")
     print("======================================================================")
     print("Precision unit conversions with history tracking")
-    print("Supports: Length, Temperature, Weight, Time")
+    print("Supports: " + ', '.join(label for _, label, _ in get_categories()))
     print("======================================================================")
 
-def show_menu():
+def show_menu(categories):
     print("\n----------------------------------------------------------------------")
     print("MAIN MENU")
     print("----------------------------------------------------------------------")
-    print("1. Length Conversion (meter, km, mile, foot, inch, etc.)")
-    print("2. Temperature Conversion (Celsius, Fahrenheit, Kelvin)")
-    print("3. Weight Conversion (kg, gram, pound, ounce, etc.)")
-    print("4. Time Conversion (second, minute, hour, day, etc.)")
-    print("5. View Conversion History")
-    print("6. View Usage Statistics")
-    print("7. Export History to File")
-    print("8. Clear History")
-    print("9. View Application Logs")
+    n = 0
+    for _, label, hint in categories:
+        n += 1
+        print(str(n) + ". " + label + " Conversion (" + hint + ")")
+    print(str(n + 1) + ". View Conversion History")
+    print(str(n + 2) + ". View Usage Statistics")
+    print(str(n + 3) + ". Export History to File")
+    print(str(n + 4) + ". Clear History")
+    print(str(n + 5) + ". View Application Logs")
     print("0. Exit")
     print("----------------------------------------------------------------------")
 
-def do_conversion(cat, conv_func, hist, log):
+def do_conversion(cat, hist, log, cache=None):
     print("\n----------------------------------------------------------------------")
-    print(cat.upper() + " CONVERSION")
+    print(CATEGORY_LABELS[cat].upper() + " CONVERSION")
     print("----------------------------------------------------------------------")
     units = get_available_units(cat)
-    print("Available units: " + ', '.join(units))
+    if units:
+        print("Available units: " + ', '.join(units))
+    else:
+        print("Combine units from any category with * and /, e.g. mile/hour, kg*m or kWh/km")
     print()
     val = get_valid_number("Enter value to convert: ", allow_negative=True)
     if val == None:
         return
-    from_unit = get_valid_choice("From unit: ", units, case_sensitive=False)
+    from_unit = get_valid_unit("From unit: ", cat)
     if from_unit == None:
         return
-    to_unit = get_valid_choice("To unit: ", units, case_sensitive=False)
+    to_unit = get_valid_unit("To unit: ", cat)
     if to_unit == None:
         return
+    perform_conversion(cat, val, from_unit, to_unit, hist, log, cache)
+
+@metrics.timed("do_conversion")
+def perform_conversion(cat, val, from_unit, to_unit, hist, log, cache=None):
     try:
-        ans = conv_func(val, from_unit, to_unit)
+        if cache != None:
+            ans = cache.convert(cat, val, from_unit, to_unit)
+        else:
+            ans = convert(cat, val, from_unit, to_unit)
         print("\n======================================================================")
         print("CONVERSION RESULT")
         print("======================================================================")
@@ -61,55 +75,192 @@ def do_conversion(cat, conv_func, hist, log):
         display_error("Unexpected error: " + str(e))
         log.log_error_conversion(cat, "Unexpected: " + str(e))
 
+def show_cache_stats(cache, log):
+    stats = cache.stats()
+    print("Conversion Cache: " + str(stats['size']) + "/" + str(stats['maxsize']) + " entries")
+    print("   Hits: " + str(stats['hits']) + "  Misses: " + str(stats['misses'])
+          + "  Evictions: " + str(stats['evictions']) + "  Hit rate: " + format(stats['hit_rate'], ".1%"))
+    log.log_cache_stats(stats)
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="main.py", description="Unit Converter Pro")
+    parser.add_argument("--history-db", metavar="FILE", help="keep history in this SQLite database instead of JSON")
+    parser.add_argument("--history-bin", metavar="FILE", help="keep history in this memory-mapped binary file instead of JSON")
+    parser.add_argument("--cache-size", type=int, default=0, help="cache this many recent conversions (default: off)")
+    parser.add_argument("--metrics", metavar="FILE", help="record hot-path timings and write them to this Prometheus text file")
+    modes = parser.add_subparsers(dest="mode")
+    batch = modes.add_parser("batch", help="convert a CSV/JSONL file without the menu")
+    batch.add_argument("--in", dest="in_file", required=True, help="input CSV or JSONL file")
+    batch.add_argument("--out", dest="out_file", required=True, help="output file (same format as input)")
+    batch.add_argument("--category", required=True, help="unit category, e.g. length, temperature or data (see units.json)")
+    batch.add_argument("--from", dest="from_unit", required=True, help="source unit")
+    batch.add_argument("--to", dest="to_unit", required=True, help="target unit")
+    batch.add_argument("--column", default="value", help="column/key holding the value (default: value)")
+    batch.add_argument("--out-column", default="result", help="column/key for the result (default: result)")
+    batch.add_argument("--reject", dest="reject_file", help="file for bad rows (default: <out>.rejects.<ext>)")
+    batch.add_argument("--format", dest="fmt", choices=["csv", "jsonl"], help="record format (default: from extension)")
+    batch.add_argument("--workers", type=int, default=1, help="worker processes, 0 = one per CPU (default: 1)")
+    batch.add_argument("--chunk-size", type=int, default=CHUNK_BYTES, help="bytes per worker chunk (default: 8 MiB)")
+    serve = modes.add_parser("serve", help="run the HTTP conversion service")
+    serve.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    serve.add_argument("--port", type=int, default=8080, help="port to listen on (default: 8080)")
+    export = modes.add_parser("export", help="export history as CSV, JSONL or compact binary")
+    export.add_argument("--out", dest="out_file", required=True, help="output file")
+    export.add_argument("--format", dest="fmt", choices=["csv", "jsonl", "bin"], help="export format (default: from extension)")
+    export.add_argument("--analytics", action="store_true", help="write a JSON analytics report (value distributions, top pairs, throughput) instead of the records")
+    export.add_argument("--top", type=int, default=10, help="unit pairs ranked in the analytics report (default: 10)")
+    export.add_argument("--bins", type=int, default=10, help="histogram bins per unit in the analytics report (default: 10)")
+    pipe = modes.add_parser("pipe", help="answer '<id> <category> <value> <from> <to>' lines on stdin")
+    pipe.add_argument("--record", action="store_true", help="also add each conversion to history and the log")
+    return parser
+
+def open_history(args, flush_every=1):
+    if args.history_db:
+        from history_db import SQLiteConversionHistory
+        return SQLiteConversionHistory(args.history_db)
+    if args.history_bin:
+        from history_mmap import MappedConversionHistory
+        return MappedConversionHistory(args.history_bin, flush_every=flush_every)
+    return ConversionHistory(max_entries=50, journal=True, flush_every=flush_every)
+
+def serve_mode(args):
+    from server import serve
+    hist = open_history(args, flush_every=64)
+    log = ApplicationLogger(console_output=False, async_write=True, max_bytes=5 * 1024 * 1024)
+    log.log_user_action("HTTP service on " + args.host + ":" + str(args.port))
+    try:
+        serve(args.host, args.port, hist, log, metrics_file=args.metrics)
+    except OSError as e:
+        display_error(str(e))
+        log.error("HTTP service failed: " + str(e))
+        return 1
+    finally:
+        hist.close()
+        log.close_session()
+    return 0
+
+def pipe_mode(args):
+    log = ApplicationLogger(console_output=False, async_write=True, max_bytes=5 * 1024 * 1024)
+    log.log_user_action("Pipe mode started")
+    hist = None
+    recorder = None
+    if args.record:
+        from server import RecordWriter
+        hist = open_history(args, flush_every=64)
+        recorder = RecordWriter(hist, log)
+    convert_fn = convert
+    if args.cache_size > 0:
+        cache = ConversionCache(maxsize=args.cache_size)
+        convert_fn = cache.convert
+    try:
+        counts = run_pipe(convert_fn=convert_fn, recorder=recorder)
+    except (BrokenPipeError, KeyboardInterrupt):
+        counts = None
+    finally:
+        if recorder != None:
+            recorder.close()
+            hist.close()
+    if counts != None:
+        log.info("Pipe mode finished: " + str(counts['requests']) + " requests, "
+                 + str(counts['errors']) + " errors")
+    log.close_session()
+    return 0
+
+def export_mode(args):
+    hist = open_history(args)
+    if args.analytics:
+        ok = hist.export_analytics(args.out_file, top=args.top, bins=args.bins)
+        hist.close()
+        if not ok:
+            return 1
+        return 0
+    rows = hist.export(args.out_file, args.fmt)
+    hist.close()
+    if rows == None:
+        return 1
+    return 0
+
+def batch_mode(args):
+    log = ApplicationLogger(console_output=False, async_write=True, max_bytes=5 * 1024 * 1024)
+    log.log_user_action("Batch conversion: " + args.in_file + " -> " + args.out_file)
+    try:
+        stats = run_batch(args.in_file, args.out_file, args.category, args.from_unit, args.to_unit,
+                          column=args.column, output_column=args.out_column,
+                          reject_file=args.reject_file, fmt=args.fmt,
+                          workers=args.workers, chunk_bytes=args.chunk_size)
+    except (OSError, ValueError) as e:
+        display_error(str(e))
+        log.error("Batch conversion failed: " + str(e))
+        log.close_session()
+        return 1
+    summary = (str(stats['rows']) + " rows (" + str(stats['converted']) + " converted, "
+               + str(stats['rejected']) + " rejected) in " + format(stats['seconds'], ".2f")
+               + "s - " + format(stats['rows_per_sec'], ",.0f") + " rows/sec")
+    print(summary)
+    log.info("Batch conversion finished: " + summary)
+    log.close_session()
+    return 0
+
 def main():
-    hist = ConversionHistory(max_entries=50)
-    log = ApplicationLogger(console_output=False)
+    args = build_parser().parse_args()
+    if args.metrics:
+        metrics.enable()
+    if args.mode != None:
+        modes = {"batch": batch_mode, "serve": serve_mode, "pipe": pipe_mode, "export": export_mode}
+        try:
+            code = modes[args.mode](args)
+        finally:
+            # The interactive menu writes the file itself; other modes write it on the way out
+            if args.metrics:
+                metrics.write_prometheus(args.metrics)
+        sys.exit(code)
+    hist = open_history(args)
+    log = ApplicationLogger(console_output=False, async_write=True, max_bytes=5 * 1024 * 1024)
+    cache = None
+    if args.cache_size > 0:
+        cache = ConversionCache(maxsize=args.cache_size)
     show_banner()
     log.log_user_action("Application started")
     print("\nWelcome! Let's convert some units.")
+    categories = get_categories()
+    n = len(categories)
     while True:
-        show_menu()
-        choice = get_menu_choice(min_choice=0, max_choice=9)
+        show_menu(categories)
+        choice = get_menu_choice(min_choice=0, max_choice=n + 5)
         if choice == None:
             continue
-        if choice == 1:
-            log.log_user_action("Selected Length Conversion")
-            do_conversion('length', convert_length, hist, log)
-        
-        elif choice == 2:
-            log.log_user_action("Selected Temperature Conversion")
-            do_conversion('temperature', convert_temperature, hist, log)
-        
-        elif choice == 3:
-            log.log_user_action("Selected Weight Conversion")
-            do_conversion('weight', convert_weight, hist, log)
-        
-        elif choice == 4:
-            log.log_user_action("Selected Time Conversion")
-            do_conversion('time', convert_time, hist, log)
+        if 1 <= choice <= n:
+            cat, label, _ = categories[choice - 1]
+            log.log_user_action("Selected " + label + " Conversion")
+            do_conversion(cat, hist, log, cache)
         
-        elif choice == 5:
+        elif choice == n + 1:
             log.log_user_action("Viewed conversion history")
             hist.display_history(limit=15)
         
-        elif choice == 6:
+        elif choice == n + 2:
             log.log_user_action("Viewed usage statistics")
             hist.display_statistics()
         
-        elif choice == 7:
+        elif choice == n + 3:
             log.log_user_action("Exported history to file")
             hist.export_to_text('conversion_history_export.txt')
         
-        elif choice == 8:
+        elif choice == n + 4:
             if confirm_action("Clear all conversion history?"):
                 hist.clear_history()
                 log.log_user_action("Cleared conversion history")
             else:
                 print("\nHistory clear cancelled.\n")
         
-        elif choice == 9:
+        elif choice == n + 5:
             log.log_user_action("Viewed application logs")
             print(log.get_log_summary())
+            if cache != None:
+                show_cache_stats(cache, log)
+            if args.metrics:
+                print(metrics.format_summary())
+                metrics.write_prometheus(args.metrics)
         
         elif choice == 0:
             log.log_user_action("Exiting application")
@@ -124,6 +275,11 @@ def main():
             print("\nYour conversion history has been saved.")
             print("Come back anytime for more conversions!\n")
             print("======================================================================\n")
+            hist.close()
+            if cache != None:
+                log.log_cache_stats(cache.stats())
+            if args.metrics:
+                metrics.write_prometheus(args.metrics)
             log.close_session()
             sys.exit(0)
 
@@ -0,0 +1,184 @@
+"""
+Metrics Module
+Lightweight call counting and latency histograms for the hot paths
+Author: [Your Name]
+Date: November 24, 2025
+"""
+
+from bisect import bisect_left
+from functools import wraps
+import os
+import sys
+import time
+
+# Histogram bucket upper bounds in seconds: 1µs to ~10s, four per decade
+BUCKETS = tuple(10 ** (exp / 4) * 1e-6 for exp in range(29))
+
+_enabled = False
+_histograms = {}
+
+# (plain function, timing wrapper) for every function decorated with timed()
+_instrumented = []
+
+class Histogram:
+    """Call count, total time and bucketed latencies for one instrumented function"""
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.total = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)  # last bucket is +Inf
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.buckets[bisect_left(BUCKETS, seconds)] += 1
+
+    def percentile(self, pct):
+        """
+        Estimate a latency percentile (0-100) from the buckets
+
+        Interpolates linearly inside the bucket that holds the rank, so the
+        result is accurate to the bucket resolution (about ±30%).
+        """
+        if not self.count:
+            return 0.0
+        rank = self.count * pct / 100
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            if n and seen + n >= rank:
+                lower = BUCKETS[i - 1] if i > 0 else 0.0
+                upper = BUCKETS[i] if i < len(BUCKETS) else BUCKETS[-1]
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+        return BUCKETS[-1]
+
+    def reset(self):
+        self.count = 0
+        self.total = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+def _rebind(replacements):
+    """
+    Swap functions for their replacements wherever they are bound
+
+    Looks in every loaded module's namespace (which covers modules that did
+    'from converter import convert') and in the classes they define.
+
+    Args:
+        replacements (dict): id(function) -> (function, replacement)
+    """
+    def swap(namespace, assign):
+        for key, value in list(namespace.items()):
+            found = replacements.get(id(value))
+            if found is not None and found[0] is value:
+                assign(key, found[1])
+
+    for module in list(sys.modules.values()):
+        namespace = getattr(module, '__dict__', None)
+        if not isinstance(namespace, dict):
+            continue
+        swap(namespace, namespace.__setitem__)
+        for value in list(namespace.values()):
+            if isinstance(value, type) and value.__module__ == module.__name__:
+                swap(vars(value), lambda key, fn, cls=value: setattr(cls, key, fn))
+
+def enable(on=True):
+    """
+    Switch instrumentation on (or off with on=False)
+
+    Installs the timing wrappers of every timed() function (or puts the
+    plain functions back), so instrumentation costs nothing while off.
+    """
+    global _enabled
+    if on == _enabled:
+        return
+    _enabled = on
+    if on:
+        _rebind({id(fn): (fn, wrapper) for fn, wrapper in _instrumented})
+    else:
+        _rebind({id(wrapper): (wrapper, fn) for fn, wrapper in _instrumented})
+
+def is_enabled():
+    return _enabled
+
+def timed(name):
+    """
+    Decorator that records calls and latency under name while enabled
+
+    The function itself is returned while instrumentation is off, so calls
+    go straight to it; enable() swaps the timing wrapper in.
+    """
+    histogram = _histograms.setdefault(name, Histogram(name))
+
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - start)
+        _instrumented.append((fn, wrapper))
+        return wrapper if _enabled else fn
+    return decorate
+
+def snapshot():
+    """
+    Get per-function metrics
+
+    Returns:
+        dict: name -> {'count', 'total', 'p50', 'p95', 'p99'} (seconds)
+    """
+    return {
+        name: {
+            'count': h.count,
+            'total': h.total,
+            'p50': h.percentile(50),
+            'p95': h.percentile(95),
+            'p99': h.percentile(99)
+        }
+        for name, h in sorted(_histograms.items())
+    }
+
+def format_summary():
+    """Human-readable metrics table for the logs menu"""
+    lines = ["\n⏱️  Performance Metrics (µs)",
+             f"   {'function':22s} {'calls':>8s} {'p50':>10s} {'p95':>10s} {'p99':>10s}"]
+    for name, m in snapshot().items():
+        if not m['count']:
+            continue
+        lines.append(f"   {name:22s} {m['count']:8d} {m['p50'] * 1e6:10.1f} "
+                     f"{m['p95'] * 1e6:10.1f} {m['p99'] * 1e6:10.1f}")
+    if len(lines) == 2:
+        lines.append("   No calls recorded yet.")
+    return "\n".join(lines) + "\n"
+
+def write_prometheus(filename):
+    """
+    Write all histograms in Prometheus text exposition format
+
+    The file is written to a temporary name and renamed into place, so the
+    node exporter textfile collector never reads a partial file.
+    """
+    metric = 'unitconverter_call_duration_seconds'
+    lines = [f"# HELP {metric} Latency of instrumented Unit Converter Pro functions.",
+             f"# TYPE {metric} histogram"]
+    for name, h in sorted(_histograms.items()):
+        cumulative = 0
+        for bound, n in zip(BUCKETS, h.buckets):
+            cumulative += n
+            lines.append(f'{metric}_bucket{{function="{name}",le="{bound:.6g}"}} {cumulative}')
+        lines.append(f'{metric}_bucket{{function="{name}",le="+Inf"}} {h.count}')
+        lines.append(f'{metric}_sum{{function="{name}"}} {h.total:.9f}')
+        lines.append(f'{metric}_count{{function="{name}"}} {h.count}')
+
+    temp_filename = filename + '.tmp'
+    with open(temp_filename, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(temp_filename, filename)
+
+def reset():
+    """Clear all recorded metrics"""
+    for h in _histograms.values():
+        h.reset()
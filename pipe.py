@@ -0,0 +1,101 @@
+"""
+Pipe Mode Module
+Resident co-process that answers conversion requests on stdin/stdout
+Author: [Your Name]
+Date: November 24, 2025
+
+Protocol (one request per line, UTF-8):
+    request:  <id> <category> <value> <from_unit> <to_unit>
+    reply:    <id> <result>
+    error:    <id> ERR <message>
+
+Blank lines and lines starting with '#' are ignored. Replies come back in
+request order. Output is block-buffered and flushed once per chunk of input,
+so a client that pipelines many requests gets them answered in bulk while a
+client that sends one line and waits still gets its reply straight away.
+"""
+
+import math
+import sys
+
+from converter import convert, resolve_units
+from validator import validate_number
+
+# Bytes requested from stdin per read
+READ_SIZE = 1 << 16
+
+def handle_request(line, convert_fn=convert):
+    """
+    Answer one request line
+
+    Args:
+        line (str): Request without the trailing newline
+        convert_fn (callable): convert() or a ConversionCache's convert method
+
+    Returns:
+        tuple: (reply line, conversion tuple or None) - the tuple is
+               (category, value, from_unit, to_unit, result) for recording
+    """
+    parts = line.split()
+    if not parts:
+        return None, None
+    request_id = parts[0]
+    if len(parts) != 5:
+        return f"{request_id} ERR Expected: <id> <category> <value> <from_unit> <to_unit>", None
+    _, category, value, from_unit, to_unit = parts
+    try:
+        number = validate_number(value)
+        category, from_unit, to_unit = resolve_units(category, from_unit, to_unit)
+        result = convert_fn(category, number, from_unit, to_unit)
+    except ValueError as e:
+        return f"{request_id} ERR {e}", None
+    if not math.isfinite(result):
+        return f"{request_id} ERR Result is not a finite number", None
+    return f"{request_id} {result!r}", (category, number, from_unit, to_unit, result)
+
+def run_pipe(stdin=None, stdout=None, convert_fn=convert, recorder=None):
+    """
+    Serve requests until stdin is closed
+
+    Args:
+        stdin: Binary input stream (default: sys.stdin.buffer)
+        stdout: Binary output stream (default: sys.stdout.buffer)
+        convert_fn (callable): Conversion function used for every request
+        recorder: Optional server.RecordWriter; conversions are handed to it
+                  so history and log writes stay off the request path
+
+    Returns:
+        dict: Request counts {'requests', 'errors'}
+    """
+    stdin = stdin if stdin is not None else sys.stdin.buffer
+    stdout = stdout if stdout is not None else sys.stdout.buffer
+    # read1 returns whatever is already available instead of waiting for a full block
+    read = getattr(stdin, 'read1', stdin.read)
+    counts = {'requests': 0, 'errors': 0}
+    pending = b''
+
+    while True:
+        data = read(READ_SIZE)
+        if data:
+            lines = (pending + data).split(b'\n')
+            pending = lines.pop()
+        else:
+            # End of input: answer a last request that had no trailing newline
+            lines, pending = [pending], b''
+        replies = []
+        for raw in lines:
+            line = raw.decode('utf-8', 'replace').strip()
+            if not line or line.startswith('#'):
+                continue
+            reply, record = handle_request(line, convert_fn)
+            counts['requests'] += 1
+            if record is None:
+                counts['errors'] += 1
+            elif recorder is not None:
+                recorder.conversion(*record)
+            replies.append(reply)
+        if replies:
+            stdout.write(('\n'.join(replies) + '\n').encode('utf-8'))
+            stdout.flush()
+        if not data:
+            return counts
@@ -0,0 +1,346 @@
+"""
+HTTP Service Module
+Serves conversions over HTTP with a stdlib asyncio server
+Author: [Your Name]
+Date: November 24, 2025
+
+Endpoints (all responses are JSON):
+    GET  /health
+    GET  /units[?category=length]
+    GET  /convert?category=length&value=12.5&from=foot&to=meter
+    POST /convert   {"category": ..., "value": ..., "from": ..., "to": ...}
+    POST /batch     {"category": ..., "from": ..., "to": ..., "values": [...]}
+    GET  /stats
+"""
+
+from urllib.parse import parse_qsl, urlsplit
+import asyncio
+import json
+import math
+import queue
+import threading
+
+from converter import CATEGORY_UNITS, convert, convert_many, get_available_units, resolve_units
+from validator import validate_number
+import metrics
+
+# Largest request body accepted (bytes)
+MAX_BODY = 16 << 20
+
+# Seconds between rewrites of the Prometheus metrics file while serving
+METRICS_INTERVAL = 15
+
+REASONS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error'
+}
+
+class HttpError(Exception):
+    """Error returned to the client with an HTTP status"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class RecordWriter:
+    """
+    Background thread that records conversions in history and the log
+
+    Request handlers only put a tuple on a queue, so history and log I/O
+    never run on the event loop.
+    """
+
+    def __init__(self, hist, log):
+        self.hist = hist
+        self.log = log
+        self.lock = threading.Lock()
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name='record-writer', daemon=True)
+        self._thread.start()
+
+    def conversion(self, category, value, from_unit, to_unit, result):
+        self._queue.put(('conversion', category, value, from_unit, to_unit, result))
+
+    def batch(self, category, count, from_unit, to_unit):
+        self._queue.put(('batch', category, count, from_unit, to_unit))
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            try:
+                with self.lock:
+                    if item[0] == 'conversion':
+                        if self.hist is not None:
+                            self.hist.add_conversion(*item[1:])
+                        if self.log is not None:
+                            self.log.log_conversion(*item[1:])
+                    elif self.log is not None:
+                        _, category, count, from_unit, to_unit = item
+                        self.log.info(f"Batch conversion - {category}: {count} values {from_unit} → {to_unit}")
+            except Exception as e:
+                print(f"⚠️  Warning: Could not record conversion: {e}")
+
+    def statistics(self):
+        """History statistics, read under the writer's lock"""
+        if self.hist is None:
+            return None
+        with self.lock:
+            return self.hist.get_statistics()
+
+    def close(self):
+        """Record everything still queued, then stop"""
+        self._queue.put(None)
+        self._thread.join()
+
+def _number(value, name='value'):
+    """Accept a finite JSON number or numeric string (validator rules)"""
+    if isinstance(value, bool):
+        raise HttpError(400, f"'{name}' must be a number")
+    if isinstance(value, str):
+        try:
+            return validate_number(value)
+        except ValueError as e:
+            raise HttpError(400, f"'{name}': {e}") from None
+    if not isinstance(value, (int, float)):
+        raise HttpError(400, f"'{name}' must be a number")
+    try:
+        number = float(value)
+    except OverflowError:
+        number = math.inf
+    # json.loads accepts NaN and Infinity, which there is no valid JSON to answer with
+    if not math.isfinite(number):
+        raise HttpError(400, f"'{name}' must be a finite number")
+    return number
+
+def _field(data, name):
+    value = data.get(name)
+    if not isinstance(value, str) or not value:
+        raise HttpError(400, f"Missing '{name}'")
+    return value
+
+class ConversionService:
+    """Routes HTTP requests to the converter"""
+
+    def __init__(self, writer=None):
+        self.writer = writer
+        self.routes = {
+            ('GET', '/health'): self.health,
+            ('GET', '/units'): self.units,
+            ('GET', '/convert'): self.convert_query,
+            ('POST', '/convert'): self.convert_body,
+            ('POST', '/batch'): self.batch,
+            ('GET', '/stats'): self.stats
+        }
+
+    def handle(self, method, target, body):
+        """
+        Dispatch one request
+
+        Returns:
+            tuple: (status, JSON-serializable payload, or a coroutine that
+                   returns it for handlers that must not block the loop)
+        """
+        url = urlsplit(target)
+        handler = self.routes.get((method, url.path))
+        if handler is None:
+            if any(path == url.path for _, path in self.routes):
+                raise HttpError(405, f"{method} not allowed on {url.path}")
+            raise HttpError(404, f"No such endpoint: {url.path}")
+        return 200, handler(dict(parse_qsl(url.query)), body)
+
+    def health(self, params, body):
+        return {'status': 'ok'}
+
+    def units(self, params, body):
+        category = params.get('category')
+        if category is None:
+            return {'units': CATEGORY_UNITS}
+        units = get_available_units(category)
+        if not units:
+            raise HttpError(404, f"Invalid category: {category}")
+        return {'category': category.lower(), 'units': units}
+
+    def _convert(self, data):
+        category = _field(data, 'category')
+        from_unit = _field(data, 'from')
+        to_unit = _field(data, 'to')
+        value = _number(data.get('value'))
+        try:
+            category, from_unit, to_unit = resolve_units(category, from_unit, to_unit)
+            result = convert(category, value, from_unit, to_unit)
+        except ValueError as e:
+            raise HttpError(400, str(e)) from None
+        if not math.isfinite(result):
+            raise HttpError(400, "Result is not a finite number")
+        if self.writer is not None:
+            self.writer.conversion(category, value, from_unit, to_unit, result)
+        return {'category': category, 'value': value, 'from': from_unit, 'to': to_unit,
+                'result': result}
+
+    def convert_query(self, params, body):
+        return self._convert(params)
+
+    def convert_body(self, params, body):
+        return self._convert(_json_object(body))
+
+    def batch(self, params, body):
+        data = _json_object(body)
+        category = _field(data, 'category')
+        from_unit = _field(data, 'from')
+        to_unit = _field(data, 'to')
+        values = data.get('values')
+        if not isinstance(values, list):
+            raise HttpError(400, "'values' must be a list")
+        numbers = [_number(v, f'values[{i}]') for i, v in enumerate(values)]
+        try:
+            category, from_unit, to_unit = resolve_units(category, from_unit, to_unit)
+            results = convert_many(category, numbers, from_unit, to_unit)
+        except ValueError as e:
+            raise HttpError(400, str(e)) from None
+        if not all(map(math.isfinite, results)):
+            raise HttpError(400, "Result is not a finite number")
+        if self.writer is not None:
+            self.writer.batch(category, len(results), from_unit, to_unit)
+        return {'category': category, 'from': from_unit, 'to': to_unit, 'results': results}
+
+    async def stats(self, params, body):
+        # Statistics wait on the writer's lock and may scan the whole history,
+        # so they are gathered on an executor thread
+        stats = None
+        if self.writer is not None:
+            stats = await asyncio.get_running_loop().run_in_executor(None, self.writer.statistics)
+        return {'statistics': stats}
+
+def _json_object(body):
+    try:
+        data = json.loads(body or b'{}')
+    except ValueError as e:
+        raise HttpError(400, f"Invalid JSON: {e}") from None
+    if not isinstance(data, dict):
+        raise HttpError(400, "Request body must be a JSON object")
+    return data
+
+def _response(status, payload, keep_alive):
+    try:
+        body = json.dumps(payload, allow_nan=False).encode('utf-8')
+    except ValueError:
+        # A result that overflowed to Infinity cannot be sent as JSON
+        status = 400
+        body = json.dumps({'error': "Result is not a finite number"}).encode('utf-8')
+    head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode('ascii') + body
+
+async def _handle_connection(service, reader, writer):
+    """Serve requests on one connection (HTTP/1.1 keep-alive)"""
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            try:
+                method, target, version = request_line.decode('latin-1').split()
+            except ValueError:
+                writer.write(_response(400, {'error': 'Malformed request line'}, False))
+                break
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            connection = headers.get('connection', '').lower()
+            keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+
+            body = b''
+            try:
+                try:
+                    length = int(headers.get('content-length', 0))
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    raise HttpError(400, "Invalid Content-Length") from None
+                if length > MAX_BODY:
+                    raise HttpError(413, "Request body too large")
+                if length:
+                    body = await reader.readexactly(length)
+                status, payload = service.handle(method.upper(), target, body)
+                if asyncio.iscoroutine(payload):
+                    payload = await payload
+            except HttpError as e:
+                status, payload = e.status, {'error': str(e)}
+            except asyncio.IncompleteReadError:
+                break
+            except Exception as e:
+                status, payload = 500, {'error': f"Unexpected: {e}"}
+
+            writer.write(_response(status, payload, keep_alive))
+            await writer.drain()
+            if not keep_alive or status == 413:
+                break
+    except (ConnectionError, asyncio.CancelledError):
+        pass
+    finally:
+        writer.close()
+
+async def start_server(host='127.0.0.1', port=8080, hist=None, log=None):
+    """
+    Start the conversion service on the running event loop
+
+    Returns:
+        tuple: (asyncio.Server, RecordWriter) - close both when done
+    """
+    record_writer = RecordWriter(hist, log)
+    service = ConversionService(record_writer)
+    server = await asyncio.start_server(
+        lambda r, w: _handle_connection(service, r, w), host, port)
+    return server, record_writer
+
+async def _write_metrics(filename, interval):
+    """Rewrite the Prometheus metrics file every interval seconds, off the event loop"""
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await loop.run_in_executor(None, metrics.write_prometheus, filename)
+        except OSError as e:
+            print(f"⚠️  Warning: Could not write metrics: {e}")
+
+def serve(host='127.0.0.1', port=8080, hist=None, log=None, metrics_file=None):
+    """
+    Run the conversion service until interrupted
+
+    Args:
+        metrics_file (str): Prometheus text file rewritten every
+                            METRICS_INTERVAL seconds while serving
+    """
+    async def run():
+        server, record_writer = await start_server(host, port, hist, log)
+        address = server.sockets[0].getsockname()
+        print(f"Serving Unit Converter Pro on http://{address[0]}:{address[1]} (Ctrl+C to stop)")
+        writer_task = None
+        if metrics_file is not None:
+            writer_task = asyncio.create_task(_write_metrics(metrics_file, METRICS_INTERVAL))
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if writer_task is not None:
+                writer_task.cancel()
+            record_writer.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        print("\nServer stopped.")
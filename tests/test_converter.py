@@ -0,0 +1,76 @@
+"""
+Converter Tests
+Checks quantity parsing and rounding against the unit registry
+Author: [Your Name]
+Date: November 24, 2025
+
+Usage:
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import converter
+
+
+class ParseQuantityTest(unittest.TestCase):
+    """Multi-part quantities are summed through the conversion table"""
+
+    def test_multi_part_quantity(self):
+        for text in ('5 ft 3 in', '5ft3in', "5' 3\""):
+            quantity = converter.parse_quantity(text)
+            self.assertEqual(quantity.unit, 'foot')
+            self.assertEqual(quantity.category, 'length')
+            self.assertAlmostEqual(quantity.value, 5.25)
+
+    def test_negative_multi_part_quantity(self):
+        self.assertAlmostEqual(converter.parse_quantity('-1 ft 6 in').value, -1.5)
+
+    def test_parse_many_multi_part(self):
+        results = converter.parse_many(['5 ft 3 in', '2 m'], category='length', to_unit='meter')
+        self.assertEqual(results, [1.6002, 2.0])
+
+
+class RoundingTest(unittest.TestCase):
+    """Base categories keep fixed decimal places; new ones opt into significant digits"""
+
+    def test_base_categories_round_to_decimal_places(self):
+        self.assertEqual(converter.convert_length(-91.298, 'meter', 'kilometer'), -0.091298)
+        self.assertEqual(converter.convert_length(1, 'millimeter', 'mile'), 1e-06)
+        self.assertEqual(converter.convert_weight(1, 'milligram', 'ton'), 0.0)
+        self.assertEqual(converter.convert_time(1, 'nanosecond', 'hour'), 0.0)
+
+    def test_small_results_keep_significant_digits(self):
+        self.assertEqual(converter.convert('energy', 1, 'electronvolt', 'joule'), 1.60218e-19)
+
+    def test_pound_based_weights_agree(self):
+        self.assertEqual(converter.convert_weight(14, 'pound', 'stone'), 1.0)
+        self.assertEqual(converter.convert_weight(1, 'short ton', 'pound'), 2000.0)
+        self.assertEqual(converter.convert_weight(1, 'long ton', 'pound'), 2240.0)
+        self.assertEqual(converter.convert_weight(7000, 'grain', 'pound'), 1.0)
+        self.assertEqual(converter.convert_weight(1, 'pound', 'stone'), 0.071429)
+
+
+class CompoundUnitTest(unittest.TestCase):
+    """Compound factors stay in range and round like their categories"""
+
+    def test_factor_out_of_range(self):
+        for unit in ('ly^40', 'm/nm^40'):
+            with self.assertRaisesRegex(ValueError, 'Unit factor out of range'):
+                converter.compound_unit(unit)
+
+    def test_rounding_does_not_depend_on_direction(self):
+        self.assertEqual(converter.convert('compound', 1, 'ft^400', 'm^400'), 0.0)
+        self.assertEqual(converter.convert('compound', 1, 'm^400', 'ft^400'),
+                         round(1 / 0.3048 ** 400, 6))
+        self.assertEqual(converter.convert('compound', 1, 'm^2', 'ft^2'), 10.76391)
+        self.assertEqual(converter.convert('compound', 1, 'ft^2', 'm^2'), 0.092903)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,200 @@
+"""
+Unit Registry Module
+Loads the unit definitions in units.json and caches them in compiled form
+Author: [Your Name]
+Date: November 24, 2025
+
+units.json lists every category (in menu order) with its label, menu hint,
+rounding precision, base unit and units. A linear unit gives its "factor"
+to the base unit; an affine unit (temperature) gives "to_base" and
+"from_base" as [scale, offset] pairs. Results are rounded to "precision"
+decimal places, but a category that gives "significant" keeps at least
+that many significant digits of results too small to show that way
+(1 eV is 1.60218e-19 J, not 0.0). A linear category may also give its
+"dimension" as exponents of base dimensions ({"length": 1, "time": -1}
+for speed) and the "scale" of its base unit in the base units of those
+dimensions (0.001 for liters), which lets compound units such as
+mile/hour be built from units of different categories. The optional
+"compound" entry names the label, hint and rounding of compound units.
+Each unit may list aliases, and its plural (name + 's') is accepted
+unless "plural" is false or spells it out.
+Multi-word names are also accepted with '_' or '-' in place of spaces.
+
+Compiling turns the JSON into the lookup tables the converter uses. The
+result is kept in __pycache__/units.json.cache and reused while the data
+file's size and mtime are unchanged (or, if they changed, while its SHA-256
+still matches), so startup does not grow with the number of units.
+"""
+
+import marshal
+import os
+
+from locking import atomic_write
+
+UNITS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'units.json')
+
+# Bump when the layout of the compiled registry changes
+CACHE_FORMAT = 3
+
+def compile_registry(data):
+    """
+    Build the converter's lookup tables from parsed units.json data
+
+    Args:
+        data (dict): Parsed units.json
+
+    Returns:
+        dict: categories (list, menu order), labels, hints, precision,
+              significant (0 when not given), base, units (category -> canonical names), linear (category ->
+              unit -> factor), affine (category -> unit -> (to scale, to
+              offset, from scale, from offset)), dimensions (category ->
+              {dimension: exponent}), scales (category -> base unit scale),
+              index ((category, alias) -> unit) and symbols (alias ->
+              (category, unit), or None when the alias belongs to more than
+              one category). The compound category, if defined, comes last
+              in categories and has no units of its own.
+
+    Raises:
+        ValueError: If the data is malformed or an alias names two units
+    """
+    registry = {
+        'categories': [], 'labels': {}, 'hints': {}, 'precision': {}, 'significant': {},
+        'base': {}, 'units': {}, 'linear': {}, 'affine': {}, 'dimensions': {}, 'scales': {},
+        'index': {}, 'symbols': {}
+    }
+    index = registry['index']
+
+    for category, spec in data['categories'].items():
+        if category != category.lower() or ' ' in category:
+            raise ValueError(f"Category names must be lowercase words: {category!r}")
+        units = spec['units']
+        if spec['base'] not in units:
+            raise ValueError(f"{category}: base unit {spec['base']!r} is not defined")
+        registry['categories'].append(category)
+        registry['labels'][category] = spec.get('label', category.capitalize())
+        registry['hints'][category] = spec.get('hint', ', '.join(list(units)[:5]) + ', etc.')
+        registry['precision'][category] = int(spec['precision'])
+        registry['significant'][category] = int(spec.get('significant', 0))
+        registry['base'][category] = spec['base']
+        registry['units'][category] = list(units)
+
+        affine = any('to_base' in unit for unit in units.values())
+        if 'dimension' in spec and not affine:
+            registry['dimensions'][category] = {str(name): int(exponent)
+                                                for name, exponent in spec['dimension'].items()}
+            registry['scales'][category] = float(spec.get('scale', 1.0))
+        table = registry['affine' if affine else 'linear'][category] = {}
+        exact = {}
+        for unit, definition in units.items():
+            if affine:
+                table[unit] = (*map(float, definition['to_base']), *map(float, definition['from_base']))
+            else:
+                factor = float(definition['factor'])
+                if not factor > 0:
+                    raise ValueError(f"{category}: factor for {unit!r} must be positive")
+                table[unit] = factor
+
+            names = [unit] + list(definition.get('aliases', ()))
+            plural = definition.get('plural', True)
+            if plural is True:
+                names.append(unit + 's')
+            elif plural:
+                names.append(plural)
+            if ' ' in unit:
+                names += [name.replace(' ', sep) for name in names if ' ' in name for sep in '_-']
+            for name in names:
+                owner = exact.setdefault(name, unit)
+                if owner != unit:
+                    raise ValueError(f"{category}: {name!r} names both {owner!r} and {unit!r}")
+
+        # Exact spellings win; a lowercased spelling is only added when it
+        # names a single unit ('mb' could be megabyte or megabit)
+        lowered = {}
+        for name, unit in exact.items():
+            key = name.lower()
+            if key not in exact:
+                lowered[key] = unit if lowered.get(key, unit) == unit else None
+        for name, unit in exact.items():
+            index[(category, name)] = unit
+        for name, unit in lowered.items():
+            if unit is not None:
+                index[(category, name)] = unit
+
+    compound = data.get('compound')
+    if compound is not None:
+        if 'compound' in registry['units']:
+            raise ValueError("'compound' is reserved for compound units")
+        registry['categories'].append('compound')
+        registry['labels']['compound'] = compound.get('label', 'Compound Units')
+        registry['hints']['compound'] = compound.get('hint', 'mile/hour, kg·m, etc.')
+        registry['precision']['compound'] = int(compound['precision'])
+        registry['significant']['compound'] = int(compound.get('significant', 0))
+        registry['units']['compound'] = []
+
+    symbols = registry['symbols']
+    for (category, alias), unit in index.items():
+        if symbols.get(alias, (category, unit)) != (category, unit):
+            symbols[alias] = None
+        else:
+            symbols[alias] = (category, unit)
+    return registry
+
+def _cache_filename(path):
+    directory, name = os.path.split(path)
+    return os.path.join(directory, '__pycache__', name + '.cache')
+
+def _read_cache(cache_file):
+    """(stamp, digest, registry) from the cache file, or None if missing or unusable"""
+    try:
+        with open(cache_file, 'rb') as f:
+            fmt, stamp, digest, registry = marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if fmt != (CACHE_FORMAT, marshal.version):
+        return None
+    return tuple(stamp), digest, registry
+
+def _write_cache(cache_file, stamp, digest, registry):
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        atomic_write(cache_file, marshal.dumps(((CACHE_FORMAT, marshal.version), stamp, digest, registry)),
+                     durable=False)
+    except OSError:
+        pass  # read-only install: compile on every start instead
+
+def load_registry(path=UNITS_FILE):
+    """
+    Load the unit registry, compiling units.json only when it has changed
+
+    Args:
+        path (str): Unit definitions file
+
+    Returns:
+        dict: The compiled registry (see compile_registry)
+
+    Raises:
+        OSError: If the definitions file cannot be read
+        ValueError: If it is not valid
+    """
+    info = os.stat(path)
+    stamp = (info.st_size, info.st_mtime_ns)
+    cache_file = _cache_filename(path)
+    cached = _read_cache(cache_file)
+    if cached is not None and cached[0] == stamp:
+        return cached[2]
+
+    # Only needed when the data file changed
+    import hashlib
+    import json
+    with open(path, 'rb') as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()
+    if cached is not None and cached[1] == digest:
+        registry = cached[2]
+    else:
+        try:
+            registry = compile_registry(json.loads(raw))
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid unit definitions in {path}: {e}") from None
+    _write_cache(cache_file, stamp, digest, registry)
+    return registry
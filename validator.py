@@ -1,48 +1,81 @@
+import math
+
+from converter import COMPOUND_CATEGORY, compound_unit, get_available_units, resolve_unit
+
+def validate_number(value, allow_negative=True, min_val=None, max_val=None):
+    value = value.strip()
+    if not value:
+        raise ValueError("Please enter a value.")
+    try:
+        num = float(value)
+    except ValueError:
+        raise ValueError("Please enter a valid number.") from None
+    if not math.isfinite(num):
+        raise ValueError("Please enter a finite number.")
+    if not allow_negative and num < 0:
+        raise ValueError("Negative values not allowed.")
+    if min_val is not None and num < min_val:
+        raise ValueError(f"Value must be at least {min_val}.")
+    if max_val is not None and num > max_val:
+        raise ValueError(f"Value must not exceed {max_val}.")
+    return num
+
+def choice_index(valid_options, case_sensitive=False):
+    index = {}
+    for opt in valid_options:
+        index.setdefault(opt if case_sensitive else opt.lower(), opt)
+    return index
+
+def validate_choice(choice, valid_options, case_sensitive=False, index=None):
+    choice = choice.strip()
+    if not choice:
+        raise ValueError("Please enter a choice.")
+    if index is None:
+        index = choice_index(valid_options, case_sensitive)
+    key = choice if case_sensitive else choice.lower()
+    if key in index:
+        return index[key]
+    
+    raise ValueError(f"Invalid choice. Options: {', '.join(valid_options)}")
+
+def validate_unit(unit, category):
+    unit = unit.strip()
+    if not unit:
+        raise ValueError("Please enter a unit.")
+    canonical = resolve_unit(category, unit)
+    if canonical is None:
+        if category == COMPOUND_CATEGORY:
+            compound_unit(unit)  # raises with the reason
+        raise ValueError(f"Invalid unit. Options: {', '.join(get_available_units(category))}")
+    return canonical
+
 def get_valid_number(prompt, allow_negative=True, min_val=None, max_val=None):
     while True:
         try:
-            value = input(prompt).strip()
-            if not value:
-                print("Error: Please enter a value.\n")
-                continue
-            num = float(value)
-            if not allow_negative and num < 0:
-                print("Error: Negative values not allowed.\n")
-                continue
-            if min_val is not None and num < min_val:
-                print(f" Error: Value must be at least {min_val}.\n")
-                continue
-            if max_val is not None and num > max_val:
-                print(f"Error: Value must not exceed {max_val}.\n")
-                continue
-            return num
-        except ValueError:
-            print("Error: Please enter a valid number.\n")
+            return validate_number(input(prompt), allow_negative, min_val, max_val)
+        except ValueError as e:
+            print(f"Error: {e}\n")
         except KeyboardInterrupt:
             print("\n\nInput cancelled.\n")
             return None
 
 def get_valid_choice(prompt, valid_options, case_sensitive=False):
+    index = choice_index(valid_options, case_sensitive)
     while True:
         try:
-            choice = input(prompt).strip()
-            
-            if not choice:
-                print("Error: Please enter a choice.\n")
-                continue
-            if not case_sensitive:
-                choice_compare = choice.lower()
-                valid_compare = [opt.lower() for opt in valid_options]
-                
-                if choice_compare in valid_compare:
-                    idx = valid_compare.index(choice_compare)
-                    return valid_options[idx]
-            else:
-                if choice in valid_options:
-                    return choice
-            
-            print(f"Error: Invalid choice. Options: {', '.join(valid_options)}\n")
-        
+            return validate_choice(input(prompt), valid_options, case_sensitive, index)
+        except ValueError as e:
+            print(f"Error: {e}\n")
+        except KeyboardInterrupt:
+            print("\n\nInput cancelled.\n")
+            return None
+
+def get_valid_unit(prompt, category):
+    while True:
+        try:
+            return validate_unit(input(prompt), category)
+        except ValueError as e:
+            print(f"Error: {e}\n")
         except KeyboardInterrupt:
             print("\n\nInput cancelled.\n")
             return None